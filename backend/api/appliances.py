@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy import exists, func, select, update
 from sqlalchemy.orm import Session
 from db.session import get_db
 from db.models import Appliance, User
@@ -7,6 +8,7 @@ from datetime import datetime
 from db.models import ApplianceUsage
 from api.auth import get_current_user
 from zoneinfo import ZoneInfo
+from services import summary_cache
 from services.power_lookup import get_power_from_model
 
 IST = ZoneInfo("Asia/Kolkata")
@@ -54,23 +56,35 @@ def add_appliance(data: dict, db: Session = Depends(get_db), current_user=Depend
 
 @router.get("/")
 def list_appliances(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    appliances = db.query(Appliance).filter(Appliance.user_id == current_user.id).all()
+    # Column-only select: skips ORM object hydration (identity map,
+    # instrumentation) since the listing is read-only scalars. Also rules
+    # out lazy-load N+1s — there are no mapped instances to traverse.
+    rows = db.execute(
+        select(
+            Appliance.id,
+            Appliance.name,
+            Appliance.brand,
+            Appliance.model,
+            Appliance.power_kw,
+            Appliance.is_on,
+        ).where(Appliance.user_id == current_user.id)
+    ).all()
 
     return [
         {
-            "id": a.id,
-            "name": a.name,
-            "brand": a.brand,
-            "model": a.model,
-            "power_kw": a.power_kw,
-            "status": "ON" if a.is_on else "OFF"
+            "id": row.id,
+            "name": row.name,
+            "brand": row.brand,
+            "model": row.model,
+            "power_kw": row.power_kw,
+            "status": "ON" if row.is_on else "OFF"
         }
-        for a in appliances
+        for row in rows
     ]
 
 @router.post("/{appliance_id}/on")
 def turn_on(appliance_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    appliance = db.query(Appliance).filter(Appliance.id == appliance_id).first()
+    appliance = db.get(Appliance, appliance_id)
 
     if not appliance or appliance.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
@@ -82,68 +96,90 @@ def turn_on(appliance_id: int, db: Session = Depends(get_db), current_user: User
     appliance.last_started_at = now_ist()
 
     db.commit()
+    summary_cache.invalidate(current_user.id)
 
     return {"message": f"{appliance.name} turned ON"}
 
 @router.post("/{appliance_id}/off")
 def turn_off(appliance_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    appliance = db.query(Appliance).filter(Appliance.id == appliance_id).first()
-
-    if not appliance or appliance.user_id != current_user.id:
+    row = db.execute(
+        select(
+            Appliance.user_id,
+            Appliance.name,
+            Appliance.power_kw,
+            Appliance.is_on,
+            Appliance.last_started_at,
+        ).where(Appliance.id == appliance_id)
+    ).first()
+
+    if not row or row.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    if not appliance.is_on:
-        return {"message": f"{appliance.name} is already OFF", "energy_used_kwh": 0}
+    if not row.is_on:
+        return {"message": f"{row.name} is already OFF", "energy_used_kwh": 0}
 
     end_time = now_ist()
 
     # Guard: last_started_at may be None if the appliance was seeded as ON
     # without a recorded start time — fall back to 0 energy in that case.
-    if appliance.last_started_at is None:
+    if row.last_started_at is None:
         duration_hours = 0.0
         start_time = end_time
     else:
-        last_started = appliance.last_started_at
+        last_started = row.last_started_at
         # Ensure both datetimes are comparable (handle naive DB timestamps)
         if last_started.tzinfo is None:
             last_started = last_started.replace(tzinfo=ZoneInfo("UTC")).astimezone(IST)
         duration_hours = (end_time - last_started).total_seconds() / 3600
         start_time = last_started
 
-    energy_used = round(appliance.power_kw * max(duration_hours, 0), 3)
+    energy_used = round(row.power_kw * max(duration_hours, 0), 3)
 
-    usage = ApplianceUsage(
-        appliance_id=appliance.id,
+    # Guarded UPDATE: only flips the switch if it is still ON, so two
+    # concurrent turn-offs cannot both record the same usage session.
+    result = db.execute(
+        update(Appliance)
+        .where(Appliance.id == appliance_id, Appliance.is_on == True)
+        .values(is_on=False, last_started_at=None)
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        return {"message": f"{row.name} is already OFF", "energy_used_kwh": 0}
+
+    db.add(ApplianceUsage(
+        appliance_id=appliance_id,
         start_time=start_time,
         end_time=end_time,
         energy_kwh=energy_used
-    )
-
-    appliance.is_on = False
-    appliance.last_started_at = None
-
-    db.add(usage)
+    ))
     db.commit()
+    summary_cache.invalidate(current_user.id)
 
     return {
-        "message": f"{appliance.name} turned OFF",
+        "message": f"{row.name} turned OFF",
         "energy_used_kwh": energy_used
     }
 
 @router.get("/{appliance_id}/usage")
 def appliance_usage(appliance_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    appliance = db.query(Appliance).filter(Appliance.id == appliance_id).first()
-    if not appliance or appliance.user_id != current_user.id:
+    # Only ownership matters here — a scalar EXISTS avoids hydrating the
+    # Appliance row just to read user_id.
+    owned = db.query(
+        exists().where(
+            Appliance.id == appliance_id,
+            Appliance.user_id == current_user.id,
+        )
+    ).scalar()
+    if not owned:
         raise HTTPException(status_code=403, detail="Not authorized")
 
     today = now_ist().date()
 
-    usages = db.query(ApplianceUsage).filter(
+    # Sum in the database instead of materializing every usage row
+    total = db.query(func.coalesce(func.sum(ApplianceUsage.energy_kwh), 0.0)).filter(
         ApplianceUsage.appliance_id == appliance_id,
         ApplianceUsage.start_time >= today
-    ).all()
-
-    total = sum(u.energy_kwh for u in usages)
+    ).scalar()
 
     return {
         "appliance_id": appliance_id,
@@ -1,4 +1,8 @@
+import asyncio
+import re
+
 from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlalchemy import delete, or_, update
 from sqlalchemy.orm import Session
 from db.session import get_db
 from db.models import User, OTPRecord
@@ -23,11 +27,17 @@ from utils.security import (
     generate_otp,
     get_otp_expiry,
 )
-from datetime import datetime
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 IST = ZoneInfo("Asia/Kolkata")
 
+# Precompiled once — a single DFA pass instead of len() + isdigit()
+# walking the string twice. [0-9] is deliberate: isdigit() also accepts
+# non-ASCII digit codepoints.
+_PHONE_RE = re.compile(r"[0-9]{10}")
+_CONSUMER_RE = re.compile(r"[0-9]{10,13}")
+
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
@@ -63,19 +73,51 @@ def get_current_user(
 
 def validate_phone_number(phone_number: str) -> bool:
     """Validate phone number (10 digits)"""
-    return len(phone_number) == 10 and phone_number.isdigit()
+    return _PHONE_RE.fullmatch(phone_number) is not None
 
 
 def validate_consumer_number(consumer_number: str) -> bool:
     """Validate consumer number (10-13 digits)"""
-    return 10 <= len(consumer_number) <= 13 and consumer_number.isdigit()
+    return _CONSUMER_RE.fullmatch(consumer_number) is not None
+
+
+def _purge_stale_otps(db: Session) -> None:
+    """Bulk-delete OTP rows that expired over a day ago.
+
+    Called when a new OTP is issued so the table doesn't grow forever.
+    One DELETE statement — no rows are loaded into the session.
+    """
+    cutoff = datetime.now(IST) - timedelta(days=1)
+    db.execute(delete(OTPRecord).where(OTPRecord.expires_at < cutoff))
+
+
+def _consume_otp(db: Session, user_id: int, otp_code: str) -> bool:
+    """Atomically verify and mark an OTP as used.
+
+    A single UPDATE ... WHERE is_used=false AND expires_at>now RETURNING id
+    replaces the old load-then-modify flow, so the same code cannot be
+    replayed by two concurrent requests. Returns True if a valid OTP was
+    consumed. Caller commits.
+    """
+    row = db.execute(
+        update(OTPRecord)
+        .where(
+            OTPRecord.user_id == user_id,
+            OTPRecord.otp_code == otp_code,
+            OTPRecord.is_used == False,
+            OTPRecord.expires_at > datetime.now(IST),
+        )
+        .values(is_used=True)
+        .returning(OTPRecord.id)
+    ).first()
+    return row is not None
 
 
 
 # ==================== REGISTRATION ENDPOINTS ====================
 
 @router.post("/register", response_model=RegisterWithTokenResponse)
-def register_combined(request: CombinedRegistrationRequest, db: Session = Depends(get_db)):
+async def register_combined(request: CombinedRegistrationRequest, db: Session = Depends(get_db)):
     """
     Combined One-Step Registration - NO LOGIN REQUIRED AFTER THIS!
 
@@ -92,60 +134,43 @@ def register_combined(request: CombinedRegistrationRequest, db: Session = Depend
     - User can use the token immediately
     """
 
-    # Validate consumer number format
-    if not validate_consumer_number(request.consumer_number):
-        raise HTTPException(
-            status_code=400,
-            detail="Consumer number must be 10-13 digits"
+    # Field formats (digits-only phone/consumer, username/password length)
+    # are enforced by CombinedRegistrationRequest itself — invalid bodies
+    # never reach this handler.
+
+    # Check consumer number / phone number / username uniqueness in one
+    # query instead of three round trips, then classify in Python.
+    conflicts = db.query(
+        User.consumer_number, User.phone_number, User.username
+    ).filter(
+        or_(
+            User.consumer_number == request.consumer_number,
+            User.phone_number == request.phone_number,
+            User.username == request.username,
         )
+    ).all()
 
-    # Validate phone number format
-    if not validate_phone_number(request.phone_number):
-        raise HTTPException(
-            status_code=400,
-            detail="Phone number must be 10 digits"
-        )
-
-    # Validate username length
-    if not request.username or len(request.username) < 3:
-        raise HTTPException(
-            status_code=400,
-            detail="Username must be at least 3 characters long"
-        )
-
-    # Validate password length
-    if not request.password or len(request.password) < 6:
-        raise HTTPException(
-            status_code=400,
-            detail="Password must be at least 6 characters long"
-        )
-
-    # Check if consumer number already exists
-    existing_consumer = db.query(User).filter(User.consumer_number == request.consumer_number).first()
-    if existing_consumer:
+    if any(c == request.consumer_number for c, _, _ in conflicts):
         raise HTTPException(
             status_code=400,
             detail="This consumer number is already registered"
         )
 
-    # Check if phone number already exists
-    existing_phone = db.query(User).filter(User.phone_number == request.phone_number).first()
-    if existing_phone:
+    if any(p == request.phone_number for _, p, _ in conflicts):
         raise HTTPException(
             status_code=400,
             detail="This phone number is already registered"
         )
 
-    # Check if username already exists
-    existing_username = db.query(User).filter(User.username == request.username).first()
-    if existing_username:
+    if any(u == request.username for _, _, u in conflicts):
         raise HTTPException(
             status_code=400,
             detail="This username is already taken"
         )
 
-    # Hash the password
-    hashed_password = hash_password(request.password)
+    # Hash the password off the event loop — bcrypt is CPU-bound and
+    # deliberately slow (tens of ms), so it must not block other requests.
+    hashed_password = await asyncio.to_thread(hash_password, request.password)
 
     # Create new user
     new_user = User(
@@ -157,10 +182,11 @@ def register_combined(request: CombinedRegistrationRequest, db: Session = Depend
         is_active=True
     )
 
-    # Save to database
+    # Save to database. No refresh needed: the INSERT returns the id,
+    # created_at is a client-side default, and expire_on_commit=False
+    # keeps attributes readable after commit.
     db.add(new_user)
     db.commit()
-    db.refresh(new_user)
 
     # Seed default appliances + meter for the new user
     seed_appliances_for_user(db, new_user.id)
@@ -185,7 +211,7 @@ def register_combined(request: CombinedRegistrationRequest, db: Session = Depend
 # ==================== LOGIN ENDPOINTS ====================
 
 @router.post("/login", response_model=TokenResponse)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: Session = Depends(get_db)):
     """
     Login with username and password.
     Returns JWT access token on successful authentication.
@@ -206,8 +232,9 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
             detail="User account is inactive"
         )
 
-    # Verify password
-    if not verify_password(request.password, user.password_hash):
+    # Verify password in a worker thread — bcrypt verification is as
+    # expensive as hashing and would otherwise stall the event loop.
+    if not await asyncio.to_thread(verify_password, request.password, user.password_hash):
         raise HTTPException(
             status_code=401,
             detail="Invalid username or password"
@@ -254,11 +281,14 @@ def request_otp(request: OTPLoginRequest, db: Session = Depends(get_db)):
             detail="User account is inactive"
         )
 
-    # HARDCODED OTP for development (no SMS integration yet)
-    otp_code = "454567"
+    # Fixed dev code by default; random per-login code when OTP_DEV_CODE
+    # is cleared (no SMS integration yet)
+    otp_code = generate_otp()
     expiry_time = get_otp_expiry()
 
     # Store OTP in database
+    _purge_stale_otps(db)
+
     otp_record = OTPRecord(
         user_id=user.id,
         otp_code=otp_code,
@@ -269,7 +299,7 @@ def request_otp(request: OTPLoginRequest, db: Session = Depends(get_db)):
     db.commit()
 
 
-    print(f"[DEV] OTP for {request.phone_number}: {otp_code} (HARDCODED)")  # For development only
+    print(f"[DEV] OTP for {request.phone_number}: {otp_code}")  # For development only
 
     return OTPResponse(
         message="OTP sent successfully to your phone number",
@@ -311,22 +341,13 @@ def verify_otp(request: VerifyOTPRequest, db: Session = Depends(get_db)):
             detail="User account is inactive"
         )
 
-    # Find valid OTP record
-    otp_record = db.query(OTPRecord).filter(
-        OTPRecord.user_id == user.id,
-        OTPRecord.otp_code == request.otp_code,
-        OTPRecord.is_used == False,
-        OTPRecord.expires_at > datetime.now(IST),
-    ).first()
-
-    if not otp_record:
+    # Verify and mark used in one atomic UPDATE
+    if not _consume_otp(db, user.id, request.otp_code):
+        db.rollback()
         raise HTTPException(
             status_code=401,
             detail="Invalid or expired OTP"
         )
-
-    # Mark OTP as used
-    otp_record.is_used = True
     db.commit()
 
     # Create JWT token
@@ -357,10 +378,13 @@ def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db
     if not user.is_active:
         raise HTTPException(status_code=403, detail="User account is inactive")
 
-    # HARDCODED OTP for development (no SMS integration yet)
-    otp_code = "454567"
+    # Fixed dev code by default; random per-reset code when OTP_DEV_CODE
+    # is cleared (no SMS integration yet)
+    otp_code = generate_otp()
     expiry_time = get_otp_expiry()
 
+    _purge_stale_otps(db)
+
     otp_record = OTPRecord(
         user_id=user.id,
         otp_code=otp_code,
@@ -369,7 +393,7 @@ def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db
     db.add(otp_record)
     db.commit()
 
-    print(f"[DEV] Password-reset OTP for {request.phone_number}: {otp_code} (HARDCODED)")
+    print(f"[DEV] Password-reset OTP for {request.phone_number}: {otp_code}")
 
     return OTPResponse(
         message="OTP sent successfully. Use it to reset your password.",
@@ -398,18 +422,11 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
     if not user.is_active:
         raise HTTPException(status_code=403, detail="User account is inactive")
 
-    otp_record = db.query(OTPRecord).filter(
-        OTPRecord.user_id == user.id,
-        OTPRecord.otp_code == request.otp_code,
-        OTPRecord.is_used == False,
-        OTPRecord.expires_at > datetime.now(IST),
-    ).first()
-
-    if not otp_record:
+    # Verify and mark used in one atomic UPDATE, then set the new password
+    if not _consume_otp(db, user.id, request.otp_code):
+        db.rollback()
         raise HTTPException(status_code=401, detail="Invalid or expired OTP")
 
-    # Mark OTP as used and update password
-    otp_record.is_used = True
     user.password_hash = hash_password(request.new_password)
     db.commit()
 
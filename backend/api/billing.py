@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 from db.session import get_db
 from db.models import Bill, MeterReading, Meter
 from api.auth import get_current_user
@@ -24,8 +24,9 @@ def get_current_bill(current_user=Depends(get_current_user), db: Session = Depen
     meter = db.query(Meter).filter(Meter.user_id == current_user.id).first()
     if not meter:
         raise HTTPException(status_code=404, detail="No meter found for user")
-    readings = db.query(MeterReading).filter(MeterReading.meter_id == meter.id).all()
-    units = sum(r.energy_kwh for r in readings)
+    units = db.query(func.coalesce(func.sum(MeterReading.energy_kwh), 0.0)).filter(
+        MeterReading.meter_id == meter.id
+    ).scalar()
     amount = round(units * 7, 2)
     due_date = datetime.now().date()
     return {
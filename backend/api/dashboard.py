@@ -10,16 +10,19 @@ Endpoints:
 """
 
 import datetime
+import hashlib
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, lambda_stmt, select
 
 from db.session import get_db
-from db.models import MeterReading, Appliance, Tariff, Meter
+from db.models import MeterReading, Appliance, ApplianceUsage, Meter
 from api.auth import get_current_user
-from services.tariff_service import calculate_today_cost
+from services import summary_cache
+from services.tariff_cache import get_minute_lut
+from services.tariff_service import aggregate_today_cost
 
 IST = ZoneInfo("Asia/Kolkata")
 
@@ -54,28 +57,38 @@ def dashboard_summary(
       - today_kwh          : sum of readings since midnight IST
       - predicted_bill     : today_kwh × avg rate (₹7/unit estimate)
       - active_devices     : appliances currently ON for this user
+
+    The built payload is cached per user for a short TTL (see
+    services.summary_cache) since the dashboard polls far faster than
+    readings arrive.
     """
-    base_query = (
-        db.query(MeterReading)
+    cached = summary_cache.get(current_user.id)
+    if cached is not None:
+        return cached
+
+    # Column-only latest-reading probe: with the (meter_id, timestamp)
+    # index this is a single backward index scan, and no ORM instance is
+    # built just to read one float. lambda_stmt caches the constructed/
+    # compiled statement across polls (user id becomes a bound parameter).
+    uid = current_user.id
+    latest_stmt = lambda_stmt(
+        lambda: select(MeterReading.energy_kwh)
         .join(Meter)
-        .filter(Meter.user_id == current_user.id)
-    )
-
-    latest = (
-        base_query
+        .where(Meter.user_id == uid)
         .order_by(desc(MeterReading.timestamp))
-        .first()
+        .limit(1)
     )
+    latest_kwh = db.execute(latest_stmt).scalar()
 
     today_start = _midnight_ist()
-    readings = (
-        base_query
+    today_kwh = (
+        db.query(func.coalesce(func.sum(MeterReading.energy_kwh), 0.0))
+        .join(Meter)
+        .filter(Meter.user_id == current_user.id)
         .filter(MeterReading.timestamp >= today_start)
-        .all()
+        .scalar()
     )
 
-    today_kwh = sum(r.energy_kwh for r in readings)
-
     active_devices = (
         db.query(Appliance)
         .filter(
@@ -87,12 +100,14 @@ def dashboard_summary(
 
     predicted_bill = round(today_kwh * 7, 2)
 
-    return {
-        "current_load_kw": round(latest.energy_kwh * 4, 2) if latest else 0,
+    payload = {
+        "current_load_kw": round(latest_kwh * 4, 2) if latest_kwh is not None else 0,
         "today_kwh": round(today_kwh, 2),
         "predicted_bill": predicted_bill,
         "active_devices": active_devices,
     }
+    summary_cache.put(current_user.id, payload)
+    return payload
 
 
 # --------------------------------------------------------------------------- #
@@ -101,27 +116,57 @@ def dashboard_summary(
 
 @router.get("/consumption")
 def consumption_graph(
+    request: Request,
+    response: Response,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
     Return last 50 meter readings ordered by timestamp for the graph component.
 
+    The dashboard polls this faster than readings arrive (one per 15 s),
+    so the response carries an ETag derived from the latest reading id and
+    a matching If-None-Match gets a 304 without refetching or reserializing
+    the 50-row window.
+
     Response: [{"time": "2026-03-05T10:00:00", "kwh": 0.35}, ...]
     """
-    readings = (
-        db.query(MeterReading)
+    latest_id = db.execute(
+        select(func.max(MeterReading.id))
         .join(Meter)
-        .filter(Meter.user_id == current_user.id)
-        .order_by(MeterReading.timestamp)
-        .all()
+        .where(Meter.user_id == current_user.id)
+    ).scalar()
+
+    etag = '"' + hashlib.blake2b(
+        f"{current_user.id}:{latest_id}".encode(), digest_size=8
+    ).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, max-age=15"
+
+    # Last 50 readings selected in SQL (newest-first + LIMIT, then reversed
+    # for the graph) — the old version fetched the full history and sliced
+    # in Python, so payload and query cost grew with table size.
+    # lambda_stmt skips re-constructing/re-compiling the statement on every
+    # poll of this hot endpoint.
+    uid = current_user.id
+    graph_stmt = lambda_stmt(
+        lambda: select(MeterReading.timestamp, MeterReading.energy_kwh)
+        .join(Meter)
+        .where(Meter.user_id == uid)
+        .order_by(desc(MeterReading.timestamp))
+        .limit(50)
     )
+    rows = db.execute(graph_stmt).all()
 
-    # Convert naive timestamps (stored as IST) to aware strings (+05:30)
-    # This prevents frontend 'UTC only' assumptions.
+    # Timestamps are stored IST-naive (invariant set by now_ist() writers),
+    # so the +05:30 offset is constant — append it instead of allocating an
+    # aware datetime per row just to isoformat() it. Keeps the frontend
+    # from assuming UTC.
     return [
-        {"time": r.timestamp.replace(tzinfo=IST).isoformat(), "kwh": r.energy_kwh}
-        for r in readings[-50:]
+        {"time": ts.isoformat() + "+05:30", "kwh": kwh}
+        for ts, kwh in reversed(rows)
     ]
 
 
@@ -135,29 +180,42 @@ def appliance_usage(
     db: Session = Depends(get_db),
 ):
     """
-    Per-appliance energy breakdown for the current user.
-    Runtime is simulated at 0.5 h for each appliance.
+    Per-appliance energy breakdown for the current user since midnight IST.
+
+    Energy is aggregated from ApplianceUsage rows in a single grouped query
+    (one round trip, no per-appliance lookups). Appliances with no usage
+    today still appear with 0 kWh via the LEFT JOIN.
 
     Response: [{"name": "AC", "energy_kwh": 1.0, "power_kw": 2.0, "status": "ON"}, ...]
     """
-    appliances = (
-        db.query(Appliance)
+    today_start = _midnight_ist()
+
+    rows = (
+        db.query(
+            Appliance.name,
+            Appliance.power_kw,
+            Appliance.is_on,
+            func.coalesce(func.sum(ApplianceUsage.energy_kwh), 0.0),
+        )
+        .outerjoin(
+            ApplianceUsage,
+            (ApplianceUsage.appliance_id == Appliance.id)
+            & (ApplianceUsage.start_time >= today_start),
+        )
         .filter(Appliance.user_id == current_user.id)
+        .group_by(Appliance.id)
         .all()
     )
 
-    usage = []
-    for a in appliances:
-        runtime = 0.5  # simulated runtime in hours
-        energy = round(a.power_kw * runtime, 2)
-        usage.append({
-            "name": a.name,
-            "energy_kwh": energy,
-            "power_kw": a.power_kw,
-            "status": "ON" if a.is_on else "OFF",
-        })
-
-    return usage
+    return [
+        {
+            "name": name,
+            "energy_kwh": round(energy, 2),
+            "power_kw": power_kw,
+            "status": "ON" if is_on else "OFF",
+        }
+        for name, power_kw, is_on, energy in rows
+    ]
 
 
 # --------------------------------------------------------------------------- #
@@ -215,12 +273,6 @@ def today_cost(
     Response: {"today_kwh": 14.2, "today_cost": 72.35}
     """
     today_start = _midnight_ist()
-    readings = (
-        db.query(MeterReading)
-        .join(Meter)
-        .filter(Meter.user_id == current_user.id)
-        .filter(MeterReading.timestamp >= today_start)
-        .all()
+    return aggregate_today_cost(
+        db, get_minute_lut(db), today_start, user_id=current_user.id
     )
-    tariffs = db.query(Tariff).all()
-    return calculate_today_cost(readings, tariffs)
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import exists, func, select
 from sqlalchemy.orm import Session
 from db.session import get_db
-from db.models import MeterReading, Meter, User
+from db.models import MeterReading, MeterDailyKwh, Meter, User
+from schemas.meter import TodayUsageResponse, WeeklyUsageResponse, MonthlyUsageResponse
 from api.auth import get_current_user
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
@@ -14,126 +16,159 @@ def now_ist():
 router = APIRouter(prefix="/meter", tags=["Meter"])
 
 
+def _owns_meter(db: Session, meter_id: int, user_id: int) -> bool:
+    """Scalar EXISTS ownership probe — only hit when a query came back empty
+    and we need to distinguish 'no data' from 'not your meter'."""
+    return db.query(
+        exists().where(Meter.id == meter_id, Meter.user_id == user_id)
+    ).scalar()
+
+
 @router.get("/readings")
 def get_meter_readings(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """Get all meter readings for current user"""
-    # Fetch meter ids owned by the user
-    meters = db.query(Meter).filter(Meter.user_id == current_user.id).all()
-    meter_ids = [m.id for m in meters]
-
-    if not meter_ids:
-        return []
-
-    readings = db.query(MeterReading).filter(MeterReading.meter_id.in_(meter_ids)).all()
+    # Single JOIN instead of fetching meter ids first and filtering with
+    # IN (...) in a second query. Column-only select skips ORM hydration,
+    # and raw datetimes go straight to orjson (the app-wide response
+    # class) which serializes them natively — no per-row isoformat().
+    rows = db.execute(
+        select(
+            MeterReading.id,
+            MeterReading.meter_id,
+            MeterReading.timestamp,
+            MeterReading.energy_kwh,
+        )
+        .join(Meter, Meter.id == MeterReading.meter_id)
+        .where(Meter.user_id == current_user.id)
+    ).all()
 
-    return [
-        {
-            "id": r.id,
-            "meter_id": r.meter_id,
-            "timestamp": r.timestamp.isoformat() if r.timestamp else None,
-            "energy_kwh": r.energy_kwh
-        }
-        for r in readings
-    ]
+    return [dict(r._mapping) for r in rows]
 
 
 @router.get("/readings/{meter_id}")
 def get_meter_readings_by_id(meter_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """Get readings for a specific meter (must belong to current user)"""
-    meter = db.query(Meter).filter(Meter.id == meter_id).first()
-    if not meter or meter.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    readings = db.query(MeterReading).filter(MeterReading.meter_id == meter_id).all()
+    # Ownership folded into the WHERE clause: authorized requests cost one
+    # query; the EXISTS probe only runs when nothing came back.
+    rows = db.execute(
+        select(
+            MeterReading.id,
+            MeterReading.meter_id,
+            MeterReading.timestamp,
+            MeterReading.energy_kwh,
+        )
+        .join(Meter, Meter.id == MeterReading.meter_id)
+        .where(MeterReading.meter_id == meter_id, Meter.user_id == current_user.id)
+    ).all()
 
-    if not readings:
+    if not rows:
+        if not _owns_meter(db, meter_id, current_user.id):
+            raise HTTPException(status_code=403, detail="Not authorized")
         return {"message": "No readings found for this meter"}
 
-    return [
-        {
-            "id": r.id,
-            "meter_id": r.meter_id,
-            "timestamp": r.timestamp.isoformat() if r.timestamp else None,
-            "energy_kwh": r.energy_kwh
-        }
-        for r in readings
-    ]
+    return [dict(r._mapping) for r in rows]
 
 
-@router.get("/today-usage/{meter_id}")
+# response_model on the usage endpoints: Pydantic v2 serializes through its
+# precompiled (Rust-side) schema instead of jsonable_encoder's recursive
+# isinstance walk over plain dicts.
+@router.get("/today-usage/{meter_id}", response_model=TodayUsageResponse)
 def get_today_usage(meter_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """Get today's energy usage for a meter (must belong to current user)"""
-    meter = db.query(Meter).filter(Meter.id == meter_id).first()
-    if not meter or meter.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    today_start = datetime.combine(now_ist().date(), datetime.min.time()).replace(tzinfo=IST)
-    today_end = now_ist()
-
-    readings = db.query(MeterReading).filter(
+    # One clock read per request — reused for the window bounds and the
+    # response date instead of three separate now_ist() calls.
+    now = now_ist()
+    today_start = datetime.combine(now.date(), datetime.min.time()).replace(tzinfo=IST)
+    today_end = now
+
+    # Aggregate in SQL with ownership in the WHERE clause — one query for
+    # authorized meters, EXISTS probe only on empty results
+    total_kwh, reading_count = db.query(
+        func.coalesce(func.sum(MeterReading.energy_kwh), 0.0),
+        func.count(MeterReading.id),
+    ).join(Meter, Meter.id == MeterReading.meter_id).filter(
         MeterReading.meter_id == meter_id,
+        Meter.user_id == current_user.id,
         MeterReading.timestamp >= today_start,
         MeterReading.timestamp <= today_end
-    ).all()
+    ).one()
 
-    total_kwh = sum(r.energy_kwh for r in readings) if readings else 0
+    if reading_count == 0 and not _owns_meter(db, meter_id, current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
 
     return {
         "meter_id": meter_id,
-        "date": now_ist().date().isoformat(),
+        "date": now.date().isoformat(),
         "total_energy_kwh": round(total_kwh, 2),
-        "reading_count": len(readings)
+        "reading_count": reading_count
     }
 
 
-@router.get("/weekly-usage/{meter_id}")
+@router.get("/weekly-usage/{meter_id}", response_model=WeeklyUsageResponse)
 def get_weekly_usage(meter_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """Get weekly energy usage for a meter (must belong to current user)"""
-    meter = db.query(Meter).filter(Meter.id == meter_id).first()
-    if not meter or meter.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     today = now_ist()
     week_start = today - timedelta(days=7)
 
-    readings = db.query(MeterReading).filter(
-        MeterReading.meter_id == meter_id,
-        MeterReading.timestamp >= week_start,
-        MeterReading.timestamp <= today
+    # One query for the ≤8 pre-aggregated rollup rows; the daily buckets
+    # come back for free, so the frontend can plot a bar chart without a
+    # per-day follow-up call (rollups are maintained on every reading
+    # insert; run migrate.backfill_daily_rollups() once for databases that
+    # predate them)
+    rows = db.execute(
+        select(MeterDailyKwh.day, MeterDailyKwh.total_kwh, MeterDailyKwh.reading_count)
+        .join(Meter, Meter.id == MeterDailyKwh.meter_id)
+        .where(
+            MeterDailyKwh.meter_id == meter_id,
+            Meter.user_id == current_user.id,
+            MeterDailyKwh.day >= week_start.date(),
+            MeterDailyKwh.day <= today.date(),
+        )
+        .order_by(MeterDailyKwh.day)
     ).all()
 
-    total_kwh = sum(r.energy_kwh for r in readings) if readings else 0
+    if not rows and not _owns_meter(db, meter_id, current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    total_kwh = sum(r.total_kwh for r in rows)
+    reading_count = sum(r.reading_count for r in rows)
 
     return {
         "meter_id": meter_id,
         "period": f"{(week_start).date()} to {today.date()}",
         "total_energy_kwh": round(total_kwh, 2),
         "average_daily_kwh": round(total_kwh / 7, 2) if total_kwh > 0 else 0,
-        "reading_count": len(readings)
+        "reading_count": reading_count,
+        "daily": [
+            {"day": r.day.isoformat(), "total_kwh": round(r.total_kwh, 2)}
+            for r in rows
+        ]
     }
 
 
-@router.get("/monthly-usage/{meter_id}")
+@router.get("/monthly-usage/{meter_id}", response_model=MonthlyUsageResponse)
 def get_monthly_usage(meter_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """Get monthly energy usage for a meter (must belong to current user)"""
-    meter = db.query(Meter).filter(Meter.id == meter_id).first()
-    if not meter or meter.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     today = now_ist()
     month_start = today.replace(day=1)
 
-    readings = db.query(MeterReading).filter(
-        MeterReading.meter_id == meter_id,
-        MeterReading.timestamp >= month_start,
-        MeterReading.timestamp <= today
-    ).all()
-
-    total_kwh = sum(r.energy_kwh for r in readings) if readings else 0
+    # ≤31 rollup rows instead of a month of raw readings
+    total_kwh, reading_count = db.query(
+        func.coalesce(func.sum(MeterDailyKwh.total_kwh), 0.0),
+        func.coalesce(func.sum(MeterDailyKwh.reading_count), 0),
+    ).join(Meter, Meter.id == MeterDailyKwh.meter_id).filter(
+        MeterDailyKwh.meter_id == meter_id,
+        Meter.user_id == current_user.id,
+        MeterDailyKwh.day >= month_start.date(),
+        MeterDailyKwh.day <= today.date()
+    ).one()
+
+    if reading_count == 0 and not _owns_meter(db, meter_id, current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
 
     return {
         "meter_id": meter_id,
         "period": f"{month_start.strftime('%B %Y')}",
         "total_energy_kwh": round(total_kwh, 2),
-        "reading_count": len(readings)
+        "reading_count": reading_count
     }
@@ -16,21 +16,26 @@ Endpoints:
 """
 
 import datetime
+import hashlib
+from bisect import bisect_left
 from zoneinfo import ZoneInfo
 from typing import List
 
-from fastapi import APIRouter, Depends, Query, Path
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+import numpy as np
+from fastapi import APIRouter, Depends, Query, Path, Request, Response
+from sqlalchemy.orm import Session, raiseload
+from pydantic import BaseModel, Field
 
 from db.session import get_db
-from db.models import Tariff, Appliance, User
+from db.models import Appliance, User
 from schemas.recommendation import Recommendation
 from api.auth import get_current_user
+from services.tariff_cache import get_tariff_rows, get_price_grid, get_version as tariff_version
 from services.tariff_service import (
     simulate_cost,
-    find_cheapest_slot,
     get_price_for_timestamp,
+    build_price_grid,
+    slot_costs,
     now_ist,
 )
 
@@ -41,13 +46,21 @@ router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
 DEFAULT_WINDOW_START = "00:00"
 DEFAULT_WINDOW_END   = "23:45"
 
+# Preformatted "HH:MM" for every minute of the day — the slot scan and
+# compare endpoints index this instead of re-running strftime/f-strings.
+_MINUTE_STRS = [f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)]
+
+# ToD label buckets: price ≤ 4.0 → off-peak, ≤ 6.5 → normal, else peak
+_TOD_THRESHOLDS = (4.0, 6.5)
+_TOD_LABELS     = ("Off-Peak 🟢", "Normal 🟡", "Peak 🔴")
+
 
 # --------------------------------------------------------------------------- #
 #  Request schema for compare endpoint
 # --------------------------------------------------------------------------- #
 
 class CompareTimesRequest(BaseModel):
-    duration_minutes: int
+    duration_minutes: int = Field(..., ge=1, le=1440, description="Run duration in minutes")
     times: List[str]   # ["HH:MM", ...]
 
     model_config = {"json_schema_extra": {
@@ -67,20 +80,27 @@ def _build_recommendation(
     duration_minutes: int,
     tariff_rows     : list,
     top_n           : int = 3,
+    price_grid      = None,
+    now             : datetime.datetime = None,
 ) -> dict:
     """
     Core recommendation logic. Called by all endpoints.
 
     Steps:
     1. Simulate cost if run RIGHT NOW (IST)
-    2. Find cheapest slot using Sliding Window (full 24hr, 15-min steps)
-    3. can_use_now = True if current cost is within 15% of best
-    4. Build top N slots sorted by cost across 24 hours
-
-    All cost calculations use simulate_cost() which steps in 15-min chunks
-    to correctly handle appliances that run across tariff slab boundaries.
+    2. Compute every slot's cost in one vectorized pass over the price grid
+    3. Best slot = cheapest candidate that finishes within the day window
+    4. can_use_now = True if current cost is within 15% of best
+    5. Build top N slots sorted by cost across 24 hours
+
+    The slot-cost vector matches simulate_cost() exactly (15-min chunks,
+    tariff slab boundaries, midnight wrap), so one NumPy pass replaces the
+    old per-slot sliding-window simulations.
     """
-    now     = now_ist()
+    # One clock read per request: handlers that already read the clock for
+    # their ETag pass it in rather than calling now_ist() again here.
+    if now is None:
+        now = now_ist()
     now_str = now.strftime("%H:%M")
 
     # Step 1 — Cost if run right now
@@ -92,43 +112,54 @@ def _build_recommendation(
     )
     now_cost = now_sim["cost"]
 
-    # Step 2 — Best slot across full 24 hours
-    best = find_cheapest_slot(
-        power_kw         = appliance.power_kw,
-        duration_minutes = duration_minutes,
-        window_start_str = DEFAULT_WINDOW_START,
-        window_end_str   = DEFAULT_WINDOW_END,
-        tariff_rows      = tariff_rows,
-        step_minutes     = 15,
-    )
-    best_cost = best["expected_cost"]
-    savings   = round(max(0.0, now_cost - best_cost), 2)
+    # Step 2 — All slot costs in one vectorized pass. The grid depends only
+    # on the tariffs, so callers looping over appliances build it once and
+    # pass it in.
+    if price_grid is None:
+        price_grid = build_price_grid(tariff_rows)
+    costs       = slot_costs(appliance.power_kw, duration_minutes, price_grid)
+    rounded     = np.round(costs, 2)
+    energy_used = round(appliance.power_kw * duration_minutes / 60, 3)
+
+    # Step 3 — Best slot: same semantics as the old find_cheapest_slot over
+    # 00:00–23:45 (candidates must finish within the window, first-wins on
+    # ties), but read straight off the cost vector.
+    n_candidates = (1425 - duration_minutes) // 15 + 1
+    if n_candidates > 0:
+        best_idx        = int(np.argmin(rounded[:n_candidates]))
+        best_slot_start = _MINUTE_STRS[best_idx * 15]
+        best_cost       = float(rounded[best_idx])
+    else:
+        best_slot_start = DEFAULT_WINDOW_START
+        best_cost       = 0.0
+    savings = round(max(0.0, now_cost - best_cost), 2)
 
-    # Step 3 — can_use_now threshold: within 15% of best = green light
+    # Step 4 — can_use_now threshold: within 15% of best = green light
     can_use = now_cost <= best_cost * 1.15
 
-    # Step 4 — Build top N by scanning full day at 15-min steps
-    today    = now.date()
-    slots    = []
-    cursor   = datetime.datetime(today.year, today.month, today.day, 0, 0, tzinfo=IST)
-    end_scan = cursor + datetime.timedelta(hours=24)
+    # Step 5 — Build top N across the full day
 
-    while cursor < end_scan:
-        t_str  = cursor.strftime("%H:%M")
-        sim    = simulate_cost(appliance.power_kw, duration_minutes, t_str, tariff_rows)
-        end_dt = cursor + datetime.timedelta(minutes=duration_minutes)
+    slots = []
+    for i, raw_cost in enumerate(costs):
+        start_min = i * 15
+        t_str     = _MINUTE_STRS[start_min]
+        end_str   = _MINUTE_STRS[(start_min + duration_minutes) % (24 * 60)]
+        cost      = round(float(raw_cost), 2)
+        avg_price = (
+            round(float(raw_cost) / energy_used, 2)
+            if energy_used > 0 else float(price_grid[i])
+        )
 
         slots.append({
             "start_time"         : t_str,
-            "end_time"           : end_dt.strftime("%H:%M"),
-            "slot_label"         : f"{t_str} – {end_dt.strftime('%H:%M')}",
-            "estimated_cost_inr" : sim["cost"],
-            "avg_tariff"         : sim["price_per_unit"],
-            "energy_kwh"         : sim["energy_used"],
-            "savings_vs_now_inr" : round(max(0.0, now_cost - sim["cost"]), 2),
+            "end_time"           : end_str,
+            "slot_label"         : f"{t_str} – {end_str}",
+            "estimated_cost_inr" : cost,
+            "avg_tariff"         : avg_price,
+            "energy_kwh"         : energy_used,
+            "savings_vs_now_inr" : round(max(0.0, now_cost - cost), 2),
             "is_cheapest"        : False,
         })
-        cursor += datetime.timedelta(minutes=15)
 
     slots.sort(key=lambda x: x["estimated_cost_inr"])
     top_slots = slots[:top_n]
@@ -152,10 +183,10 @@ def _build_recommendation(
         "current_tod_label"      : _tod_label(current_price),
         "can_use_now"            : can_use,
         "current_cost_inr"       : now_cost,
-        "best_slot_start"        : best["recommended_start"],
+        "best_slot_start"        : best_slot_start,
         "best_slot_cost_inr"     : best_cost,
         "savings_if_you_wait_inr": savings,
-        "recommendation_message" : _rec_message(can_use, best, savings, appliance.name),
+        "recommendation_message" : _rec_message(can_use, best_slot_start, savings, appliance.name),
         "top_slots"              : top_slots,
     }
 
@@ -164,8 +195,8 @@ def _build_recommendation(
 #  ENDPOINT 1 — All appliances summary (original route, kept compatible)
 # --------------------------------------------------------------------------- #
 
-@router.get("/", response_model=List[Recommendation])
-async def get_recommendations(
+@router.get("/")
+def get_recommendations(
     duration_minutes: int = Query(60, description="Default run duration in minutes"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -174,17 +205,32 @@ async def get_recommendations(
     Returns best time slot for every appliance.
     Tariffs fetched once and reused for all appliances (no duplicate DB hits).
 
-    Compatible with existing response_model=List[Recommendation].
+    Payload shape is schemas.recommendation.Recommendation; the values are
+    computed server-side from trusted inputs, so they go out through
+    model_construct + orjson instead of being re-validated by a
+    response_model on every request.
     """
-    appliances  = db.query(Appliance).filter(Appliance.user_id == current_user.id).all()
-    tariff_rows = db.query(Tariff).all()
+    # raiseload guards against N+1 regressions: _build_recommendation only
+    # touches scalar columns, so any future relationship access in the loop
+    # fails loudly instead of silently issuing a query per appliance.
+    appliances = (
+        db.query(Appliance)
+        .options(raiseload("*"))
+        .filter(Appliance.user_id == current_user.id)
+        .all()
+    )
+    tariff_rows = get_tariff_rows(db)
+    # Prices don't depend on the appliance — the cached 96-slot grid is
+    # shared across every _build_recommendation call (and across requests,
+    # until the tariffs change).
+    price_grid  = get_price_grid(db)
     results     = []
 
     for appliance in appliances:
-        rec  = _build_recommendation(appliance, duration_minutes, tariff_rows, top_n=1)
+        rec  = _build_recommendation(appliance, duration_minutes, tariff_rows, top_n=1, price_grid=price_grid)
         best = rec["top_slots"][0] if rec["top_slots"] else {}
 
-        results.append(Recommendation(
+        results.append(Recommendation.model_construct(
             appliance_id           = appliance.id,
             appliance_name         = appliance.name,
             can_use_now            = rec["can_use_now"],
@@ -193,17 +239,30 @@ async def get_recommendations(
             savings_vs_peak_inr    = rec["savings_if_you_wait_inr"],
             recommendation_message = rec["recommendation_message"],
             reason                 = best.get("reason", ""),
-        ))
+        ).model_dump())
 
     return results
 
 
+def _rec_etag(*parts) -> str:
+    """Weak content key for recommendation responses.
+
+    Recommendations change when the tariffs change or the clock ticks to a
+    new minute (the payload embeds current time/cost) — both are part of
+    the key, so polling clients get 304s in between.
+    """
+    raw = ":".join(str(p) for p in parts)
+    return '"' + hashlib.blake2b(raw.encode(), digest_size=8).hexdigest() + '"'
+
+
 # --------------------------------------------------------------------------- #
 #  ENDPOINT 2 — Top N slots for one appliance
 # --------------------------------------------------------------------------- #
 
 @router.get("/{appliance_id}")
 def get_recommendation_for_appliance(
+    request         : Request,
+    response        : Response,
     appliance_id    : int     = Path(..., description="Appliance ID from DB"),
     duration_minutes: int     = Query(60, description="Run duration in minutes"),
     top_n           : int     = Query(3, ge=1, le=10, description="Number of slots"),
@@ -219,12 +278,26 @@ def get_recommendation_for_appliance(
 
     Example: GET /recommendations/1?duration_minutes=90&top_n=3
     """
-    appliance = db.query(Appliance).filter(Appliance.id == appliance_id).first()
+    appliance = db.get(Appliance, appliance_id)
     if not appliance:
         return {"success": False, "error": f"Appliance {appliance_id} not found"}
 
-    tariff_rows = db.query(Tariff).all()
-    rec         = _build_recommendation(appliance, duration_minutes, tariff_rows, top_n)
+    tariff_rows = get_tariff_rows(db)
+    now         = now_ist()
+
+    etag = _rec_etag(
+        appliance_id, duration_minutes, top_n,
+        tariff_version(), now.strftime("%H:%M"),
+    )
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, max-age=15"
+
+    rec = _build_recommendation(
+        appliance, duration_minutes, tariff_rows, top_n,
+        price_grid=get_price_grid(db), now=now,
+    )
     return {"success": True, "data": rec}
 
 
@@ -234,6 +307,8 @@ def get_recommendation_for_appliance(
 
 @router.get("/{appliance_id}/best")
 def get_best_slot(
+    request         : Request,
+    response        : Response,
     appliance_id    : int     = Path(..., description="Appliance ID from DB"),
     duration_minutes: int     = Query(60, description="Run duration in minutes"),
     db              : Session = Depends(get_db),
@@ -248,13 +323,27 @@ def get_best_slot(
 
     Example: GET /recommendations/1/best?duration_minutes=120
     """
-    appliance = db.query(Appliance).filter(Appliance.id == appliance_id).first()
+    appliance = db.get(Appliance, appliance_id)
     if not appliance:
         return {"success": False, "error": f"Appliance {appliance_id} not found"}
 
-    tariff_rows = db.query(Tariff).all()
-    rec         = _build_recommendation(appliance, duration_minutes, tariff_rows, top_n=1)
-    best        = rec["top_slots"][0] if rec["top_slots"] else {}
+    tariff_rows = get_tariff_rows(db)
+    now         = now_ist()
+
+    etag = _rec_etag(
+        appliance_id, duration_minutes, "best",
+        tariff_version(), now.strftime("%H:%M"),
+    )
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, max-age=15"
+
+    rec  = _build_recommendation(
+        appliance, duration_minutes, tariff_rows, top_n=1,
+        price_grid=get_price_grid(db), now=now,
+    )
+    best = rec["top_slots"][0] if rec["top_slots"] else {}
 
     return {
         "success"             : True,
@@ -297,27 +386,40 @@ def compare_times(
     POST /recommendations/1/compare
     Body: {"duration_minutes": 60, "times": ["08:00", "14:00", "22:00"]}
     """
-    appliance = db.query(Appliance).filter(Appliance.id == appliance_id).first()
+    appliance = db.get(Appliance, appliance_id)
     if not appliance:
         return {"success": False, "error": f"Appliance {appliance_id} not found"}
 
-    tariff_rows = db.query(Tariff).all()
-    comparisons = []
+    tariff_rows = get_tariff_rows(db)
 
+    # All requested times share the appliance and tariff table, so every
+    # candidate cost comes out of one precomputed slot-cost vector instead
+    # of a simulate_cost() loop per time. Starts snap to their containing
+    # 15-min slot (the UI only offers slot-aligned times).
+    price_grid  = get_price_grid(db)
+    costs       = slot_costs(appliance.power_kw, req.duration_minutes, price_grid)
+    energy_used = round(appliance.power_kw * req.duration_minutes / 60, 3)
+
+    comparisons = []
     for t_str in req.times:
         try:
-            sim    = simulate_cost(appliance.power_kw, req.duration_minutes, t_str, tariff_rows)
-            end_t  = _add_minutes_to_str(t_str, req.duration_minutes)
+            h, m = int(t_str[:2]), int(t_str[3:5])
+            if not (0 <= h < 24 and 0 <= m < 60):
+                raise ValueError(t_str)
+            idx   = (h * 60 + m) // 15
+            raw   = float(costs[idx])
+            avg   = round(raw / energy_used, 2) if energy_used > 0 else float(price_grid[idx])
+            end_t = _add_minutes_to_str(t_str, req.duration_minutes)
             comparisons.append({
                 "start_time"         : t_str,
                 "end_time"           : end_t,
                 "slot_label"         : f"{t_str} – {end_t}",
-                "estimated_cost_inr" : sim["cost"],
-                "avg_tariff"         : sim["price_per_unit"],
-                "tod_label"          : _tod_label(sim["price_per_unit"]),
-                "energy_kwh"         : sim["energy_used"],
+                "estimated_cost_inr" : round(raw, 2),
+                "avg_tariff"         : avg,
+                "tod_label"          : _tod_label(avg),
+                "energy_kwh"         : energy_used,
             })
-        except Exception:
+        except (ValueError, IndexError):
             comparisons.append({"start_time": t_str, "error": "Invalid format. Use HH:MM"})
 
     valid = [c for c in comparisons if "error" not in c]
@@ -345,18 +447,14 @@ def compare_times(
 # --------------------------------------------------------------------------- #
 
 def _tod_label(price: float) -> str:
-    if price <= 4.0:
-        return "Off-Peak 🟢"
-    elif price <= 6.5:
-        return "Normal 🟡"
-    return "Peak 🔴"
+    return _TOD_LABELS[bisect_left(_TOD_THRESHOLDS, price)]
 
 
-def _rec_message(can_use: bool, best: dict, savings: float, name: str) -> str:
+def _rec_message(can_use: bool, best_start: str, savings: float, name: str) -> str:
     if can_use:
         return f"✅ Good time to run {name}! Tariff is near its daily low."
     return (
-        f"⏳ Wait until {best['recommended_start']} to run {name} "
+        f"⏳ Wait until {best_start} to run {name} "
         f"and save ₹{savings}."
     )
 
@@ -377,6 +475,5 @@ def _build_reason(slot: dict, rank: int, name: str) -> str:
 
 def _add_minutes_to_str(time_str: str, minutes: int) -> str:
     """Add minutes to HH:MM string, wraps at midnight."""
-    h, m  = map(int, time_str.split(":"))
-    total = h * 60 + m + minutes
-    return f"{(total // 60) % 24:02d}:{total % 60:02d}"
+    total = (int(time_str[:2]) * 60 + int(time_str[3:]) + minutes) % (24 * 60)
+    return _MINUTE_STRS[total]
@@ -12,21 +12,25 @@ Tariffs are fetched from DB once per request and passed to service functions.
 """
 
 import datetime
+import hashlib
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends
+import numpy as np
+from fastapi import APIRouter, Depends, Request, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from db.session import get_db
-from db.models import Tariff, MeterReading, User
+from db.models import User
 from api.auth import get_current_user
+from services.tariff_cache import get_minute_lut, get_tariff_rows
 from services.tariff_service import (
     get_current_tariff,
     get_full_schedule,
-    calculate_today_cost,
+    aggregate_today_cost,
     simulate_cost,
     find_cheapest_slot,
+    now_ist,
 )
 
 IST    = ZoneInfo("Asia/Kolkata")
@@ -62,12 +66,13 @@ class CheapestSlotRequest(BaseModel):
 
 
 # --------------------------------------------------------------------------- #
-#  Helper: fetch all tariffs once per request
+#  Helper: tariff rows come from the in-process cache (DB hit at most
+#  once per TTL window, not once per request)
 # --------------------------------------------------------------------------- #
 
 def _get_tariffs(db: Session) -> list:
-    """Fetch all tariff rows from DB. Called once per request."""
-    return db.query(Tariff).all()
+    """Return all tariff rows from the in-process cache."""
+    return get_tariff_rows(db)
 
 
 # --------------------------------------------------------------------------- #
@@ -75,14 +80,27 @@ def _get_tariffs(db: Session) -> list:
 # --------------------------------------------------------------------------- #
 
 @router.get("/current")
-def current_tariff(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def current_tariff(response: Response, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """
     Return the tariff slab active right now (Asia/Kolkata timezone).
 
+    The answer can only change at the next slab boundary, so the response
+    carries Cache-Control with max-age set to the seconds remaining until
+    that boundary — clients and proxies serve it locally until then.
+
     Response:
         {"current_price": 5, "time_range": "10:00 - 18:00"}
     """
     tariffs = _get_tariffs(db)
+
+    lut = get_minute_lut(db)
+    now = now_ist()
+    rolled = np.roll(lut, -(now.hour * 60 + now.minute))
+    changes = np.nonzero(rolled != rolled[0])[0]
+    minutes_left = int(changes[0]) if changes.size else 1440
+    max_age = min(max(minutes_left * 60 - now.second, 1), 3600)
+    response.headers["Cache-Control"] = f"public, max-age={max_age}"
+
     return get_current_tariff(tariffs)
 
 
@@ -91,16 +109,29 @@ def current_tariff(db: Session = Depends(get_db), current_user: User = Depends(g
 # --------------------------------------------------------------------------- #
 
 @router.get("/")
-def full_schedule(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def full_schedule(request: Request, response: Response, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """
     Return all tariff slabs ordered by start_time.
     Overnight slab (22:00–06:00) is placed last.
 
+    The schedule only changes on admin edits, so the response carries a
+    content ETag (304 on If-None-Match) plus an hour of Cache-Control.
+
     Response:
         [{"start": "06:00", "end": "10:00", "price": 6}, ...]
     """
     tariffs = _get_tariffs(db)
-    return get_full_schedule(tariffs)
+    schedule = get_full_schedule(tariffs)
+
+    etag = '"' + hashlib.blake2b(
+        repr(schedule).encode(), digest_size=8
+    ).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "public, max-age=3600"
+
+    return schedule
 
 
 # --------------------------------------------------------------------------- #
@@ -122,13 +153,9 @@ def today_cost(db: Session = Depends(get_db), current_user: User = Depends(get_c
         hour=0, minute=0, second=0, microsecond=0
     ).replace(tzinfo=None)  # Remove timezone info for SQLAlchemy comparison
 
-    readings = (
-        db.query(MeterReading)
-        .filter(MeterReading.timestamp >= today_ist)
-        .all()
-    )
-    tariffs  = _get_tariffs(db)
-    return calculate_today_cost(readings, tariffs)
+    # Aggregated in SQL per minute-of-day — at most 1440 bucket rows come
+    # back regardless of reading volume, then priced with the cached LUT
+    return aggregate_today_cost(db, get_minute_lut(db), today_ist)
 
 
 # --------------------------------------------------------------------------- #
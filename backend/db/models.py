@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Time, Text
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, Boolean, ForeignKey, DateTime, Date, Time, Text, Index
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 from zoneinfo import ZoneInfo
@@ -45,20 +45,51 @@ class Meter(Base):
 class MeterReading(Base):
     __tablename__ = "meter_readings"
 
+    __table_args__ = (
+        # Covers per-meter time-window scans (today/weekly/monthly usage)
+        # and latest-reading ORDER BY timestamp DESC LIMIT 1 lookups
+        Index("ix_reading_meter_ts", "meter_id", "timestamp"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     meter_id = Column(Integer, ForeignKey("meters.id"))
-    timestamp = Column(DateTime, default=now_ist)
+    timestamp = Column(DateTime, default=now_ist, index=True)
     energy_kwh = Column(Float)
+    # Denormalized minute-of-day (0-1439, IST) set at insert time, so
+    # tariff-slab aggregations group on a small indexed integer instead
+    # of extracting it from the timestamp per row
+    minute_of_day = Column(SmallInteger, index=True)
 
     meter = relationship("Meter", back_populates="readings")
 
 
+# ---------------- DAILY ROLLUPS ----------------
+class MeterDailyKwh(Base):
+    """Per-meter, per-day aggregate of raw readings.
+
+    Maintained incrementally on every reading insert so weekly/monthly
+    usage endpoints sum ≤31 rollup rows instead of rescanning the raw
+    meter_readings table.
+    """
+    __tablename__ = "meter_daily_kwh"
+
+    __table_args__ = (
+        Index("ix_daily_meter_day", "meter_id", "day", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    meter_id = Column(Integer, ForeignKey("meters.id"))
+    day = Column(Date)
+    total_kwh = Column(Float, default=0.0)
+    reading_count = Column(Integer, default=0)
+
+
 # ---------------- APPLIANCES ----------------
 class Appliance(Base):
     __tablename__ = "appliances"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
 
     name = Column(String)
     brand = Column(String, nullable=True)
@@ -92,6 +123,10 @@ class Schedule(Base):
 
 class ApplianceUsage(Base):
     __tablename__ = "appliance_usage"
+    __table_args__ = (
+        # Covers the hot "today's usage per appliance" filter
+        Index("ix_usage_appliance_start", "appliance_id", "start_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     appliance_id = Column(Integer, ForeignKey("appliances.id"))
@@ -1,3 +1,4 @@
+from sqlalchemy import exists, select, text
 from sqlalchemy.orm import Session
 from .models import User, Meter, Appliance, Tariff
 from datetime import time
@@ -31,23 +32,39 @@ def seed_appliances_for_user(db: Session, user_id: int):
 
     # db.commit()
 
+SEED_LOCK_KEY = 424242  # advisory lock id shared by all instances
+
+
+def _already_seeded(db: Session) -> bool:
+    """Scalar EXISTS probe — no row fetch or ORM hydration."""
+    return db.execute(select(exists().where(User.id.isnot(None)))).scalar()
+
+
 def seed_data(db: Session):
     # prevent reseeding
-    if db.query(User).first():
+    if _already_seeded(db):
         return
 
+    # On Postgres, serialize concurrently booting workers: the lock is
+    # transaction-scoped and released by the commit below. Re-check after
+    # acquiring — another worker may have seeded while we waited.
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": SEED_LOCK_KEY})
+        if _already_seeded(db):
+            return
+
+    # Everything in one transaction: flush() assigns user.id with a single
+    # INSERT, the dependent rows batch into the same flush, and one
+    # commit replaces the previous three round-trips.
     user = User(name="Demo User")
     db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    seed_appliances_for_user(db, user.id)
+    db.flush()
 
-    tariffs = [
+    db.add(Meter(user_id=user.id))
+    db.add_all([
         Tariff(start_time=time(6,0),  end_time=time(10,0), price_per_unit=6),
         Tariff(start_time=time(10,0), end_time=time(18,0), price_per_unit=5),
         Tariff(start_time=time(18,0), end_time=time(22,0), price_per_unit=7),
         Tariff(start_time=time(22,0), end_time=time(23,59), price_per_unit=3),
-    ]
-    db.add_all(tariffs)
+    ])
     db.commit()
@@ -7,8 +7,36 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Single engine for the whole process: connections are pooled and reused
+# across requests instead of reconnecting per request.
+#   pool_pre_ping : transparently replaces stale connections
+#   pool_recycle  : recycle connections before server-side idle timeouts
+# The sizing/keepalive knobs only apply to the Postgres deployment — the
+# SQLite databases used in dev/tests get pools that reject them (an
+# in-memory URL maps to SingletonThreadPool).
+_pool_kwargs = {}
+if not DATABASE_URL.startswith("sqlite"):
+    _pool_kwargs = {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+
+engine = create_engine(
+    DATABASE_URL,
+    echo=True,
+    **_pool_kwargs,
+)
+
+# expire_on_commit=False keeps attributes readable after db.commit()
+# (e.g. appliance.name in turn_on/turn_off) without a re-SELECT.
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine,
+)
 
 def get_db():
     db = SessionLocal()
@@ -1,5 +1,6 @@
 from fastapi import FastAPI,Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.openapi.models import SecurityScheme
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -17,7 +18,7 @@ from api.tariffs import router as tariff_router
 from api.auth import router as auth_router
 from api.dashboard import router as dashboard_router
 from api.recommendations import router as recommendations_router
-from services.meter_simulator import generate_reading
+from services.meter_simulator import generate_reading, flush as flush_readings
 import os
 from importlib import import_module
 migrate = import_module('migrate')
@@ -29,13 +30,16 @@ from api.notifications import router as notifications_router
 from services.notification_service import notification_service
 from services import ws_manager
 import asyncio
-
-Base.metadata.create_all(bind=engine)
+import contextvars
+from sqlalchemy import event
 
 app = FastAPI(
     title="WattWise Backend API",
     description="Smart Electricity Management Platform",
     version="1.0.0",
+    # orjson serializes the dict/list payloads (floats, ISO strings)
+    # several times faster than the stdlib json encoder
+    default_response_class=ORJSONResponse,
 )
 
 # Configure Bearer token authentication for Swagger UI
@@ -57,6 +61,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --------------------------------------------------------------------------- #
+#  Request profiling: response-time + SQL query-count headers
+#
+#  Depends(get_db) already guarantees one session per request (FastAPI
+#  caches the dependency for the request's lifetime); this middleware makes
+#  slow endpoints and N+1 regressions visible in production responses.
+# --------------------------------------------------------------------------- #
+
+SLOW_REQUEST_SECONDS = 1.0
+
+# Per-request mutable counter; contextvars survive both the middleware task
+# and the threadpool that sync endpoints run in.
+_query_counter = contextvars.ContextVar("query_counter", default=None)
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_queries(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+@app.middleware("http")
+async def profile_request(request, call_next):
+    counter_token = _query_counter.set([0])
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        elapsed = time.perf_counter() - start
+        queries = _query_counter.get()[0]
+        _query_counter.reset(counter_token)
+
+    response.headers["X-Process-Time"] = f"{elapsed:.4f}"
+    response.headers["X-Query-Count"] = str(queries)
+
+    if elapsed > SLOW_REQUEST_SECONDS:
+        print(
+            f"🐢 Slow request: {request.method} {request.url.path} "
+            f"took {elapsed * 1000:.0f} ms ({queries} queries)"
+        )
+    return response
+
+
 app.include_router(meter_router)
 app.include_router(tariff_router)
 app.include_router(appliances_router)
@@ -117,11 +165,29 @@ def health_check():
 def db_check(db: Session = Depends(get_db)):
     return {"db": "connected"}
 
+@app.on_event("startup")
+async def log_event_loop():
+    # uvicorn picks uvloop/httptools automatically when uvicorn[standard]
+    # is installed — surface which loop actually engaged so a plain-asyncio
+    # fallback doesn't go unnoticed
+    loop = asyncio.get_running_loop()
+    print(f"⚙️  Event loop: {type(loop).__module__}.{type(loop).__name__}")
+
+
 @app.on_event("startup")
 def startup_event():
-    db = SessionLocal()
-    seed_data(db)
-    db.close()
+    # DDL runs at startup, not import time (importing main shouldn't touch
+    # the DB). CREATE_TABLES_ON_START=0 lets workers skip it entirely when
+    # scripts/init_db.py already ran in the entrypoint.
+    if os.getenv("CREATE_TABLES_ON_START", "1").lower() in ("1", "true", "yes"):
+        Base.metadata.create_all(bind=engine)
+
+    # SEED_ON_START=0 skips the demo-data check for deployments that
+    # manage their own data
+    if os.getenv("SEED_ON_START", "1").lower() in ("1", "true", "yes"):
+        db = SessionLocal()
+        seed_data(db)
+        db.close()
 
     # Optional database migrations: set RUN_MIGRATIONS=1 in env to run
     run_migs = os.getenv("RUN_MIGRATIONS", "0").lower()
@@ -130,6 +196,9 @@ def startup_event():
             print("🔄 Running migrations (RUN_MIGRATIONS=1)")
             migrate.migrate_users_table()
             migrate.create_otp_table()
+            migrate.create_performance_indexes()
+            migrate.backfill_daily_rollups()
+            migrate.add_minute_of_day_column()
             print("✅ Migrations completed")
         except Exception as e:
             print(f"⚠️ Migration failed: {e}")
@@ -143,15 +212,36 @@ def startup_event():
         pass
 
 
-def meter_loop():
-    while True:
-        generate_reading()
-        time.sleep(15)
+async def meter_loop():
+    # One long-lived session for the whole loop instead of a fresh
+    # SessionLocal() per tick. The DB work itself is sync, so each tick
+    # runs in the default threadpool; the 15-second waits are plain
+    # awaits on the event loop rather than a parked OS thread.
+    db = SessionLocal()
+    try:
+        while True:
+            await asyncio.to_thread(generate_reading, db)
+            await asyncio.sleep(15)
+    finally:
+        flush_readings(db)  # drain any queued readings on shutdown
+        db.close()
 
 @app.on_event("startup")
-def start_simulator():
-    thread = threading.Thread(target=meter_loop, daemon=True)
-    thread.start()
+async def start_simulator():
+    # SIM_ENABLED=0 disables the fake meter feed (e.g. against real data)
+    if os.getenv("SIM_ENABLED", "1").lower() not in ("1", "true", "yes"):
+        return
+    app.state.meter_task = asyncio.create_task(meter_loop())
+
+@app.on_event("shutdown")
+async def stop_simulator():
+    task = getattr(app.state, "meter_task", None)
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
 
 def self_ping_loop():
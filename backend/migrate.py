@@ -165,6 +165,109 @@ def migrate_appliances_table():
             raise
 
 
+def create_performance_indexes():
+    """Create indexes on hot filter/sort columns for existing databases.
+
+    New databases get these automatically from the model definitions via
+    Base.metadata.create_all; this covers databases created before the
+    indexes were added.
+    """
+
+    statements = [
+        "CREATE INDEX IF NOT EXISTS ix_meter_readings_timestamp ON meter_readings (timestamp)",
+        "CREATE INDEX IF NOT EXISTS ix_reading_meter_ts ON meter_readings (meter_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS ix_appliances_user_id ON appliances (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_usage_appliance_start ON appliance_usage (appliance_id, start_time)",
+    ]
+
+    with engine.connect() as connection:
+        try:
+            for stmt in statements:
+                connection.execute(text(stmt))
+            connection.commit()
+            print("✅ Performance indexes created/verified")
+        except Exception as e:
+            connection.rollback()
+            print(f"❌ Index creation failed: {e}")
+            raise
+
+
+def backfill_daily_rollups():
+    """Populate meter_daily_kwh from raw readings for pre-rollup databases.
+
+    New readings maintain the rollup incrementally (see
+    services.meter_simulator); this one-time backfill covers history
+    written before the rollup table existed. Skips if already populated.
+    """
+
+    with engine.connect() as connection:
+        try:
+            existing = connection.execute(
+                text("SELECT COUNT(*) FROM meter_daily_kwh")
+            ).scalar()
+            if existing:
+                print("✅ Daily rollups already populated")
+                return
+
+            connection.execute(text("""
+                INSERT INTO meter_daily_kwh (meter_id, day, total_kwh, reading_count)
+                SELECT meter_id, date(timestamp), SUM(energy_kwh), COUNT(*)
+                FROM meter_readings
+                GROUP BY meter_id, date(timestamp)
+            """))
+            connection.commit()
+            print("✅ Daily rollups backfilled")
+        except Exception as e:
+            connection.rollback()
+            print(f"❌ Rollup backfill failed: {e}")
+            raise
+
+
+def add_minute_of_day_column():
+    """Add and backfill meter_readings.minute_of_day for existing databases.
+
+    New readings set the column at insert time (see
+    services.meter_simulator); this covers rows written before the column
+    existed so the today-cost aggregation can group on it.
+    """
+
+    with engine.connect() as connection:
+        try:
+            connection.execute(text("SELECT minute_of_day FROM meter_readings LIMIT 1"))
+            print("✅ minute_of_day column already exists")
+            return
+        except Exception:
+            connection.rollback()
+
+    with engine.connect() as connection:
+        try:
+            connection.execute(text(
+                "ALTER TABLE meter_readings ADD COLUMN minute_of_day SMALLINT"
+            ))
+            if engine.dialect.name == "postgresql":
+                connection.execute(text("""
+                    UPDATE meter_readings
+                    SET minute_of_day = EXTRACT(HOUR FROM timestamp)::int * 60
+                                      + EXTRACT(MINUTE FROM timestamp)::int
+                """))
+            else:
+                connection.execute(text("""
+                    UPDATE meter_readings
+                    SET minute_of_day = CAST(strftime('%H', timestamp) AS INTEGER) * 60
+                                      + CAST(strftime('%M', timestamp) AS INTEGER)
+                """))
+            connection.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_meter_readings_minute_of_day "
+                "ON meter_readings (minute_of_day)"
+            ))
+            connection.commit()
+            print("✅ minute_of_day column added and backfilled")
+        except Exception as e:
+            connection.rollback()
+            print(f"❌ minute_of_day migration failed: {e}")
+            raise
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("🔄 WattWise Database Migration Script")
@@ -180,6 +283,12 @@ if __name__ == "__main__":
         print()
         migrate_appliances_table()
         print()
+        create_performance_indexes()
+        print()
+        backfill_daily_rollups()
+        print()
+        add_minute_of_day_column()
+        print()
         print("=" * 60)
         print("✅ DATABASE MIGRATION COMPLETE")
         print("=" * 60)
@@ -12,8 +12,7 @@ class Appliance(BaseModel):
     power_watts: float
     is_on: bool
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
 
 
 class ApplianceCommand(BaseModel):
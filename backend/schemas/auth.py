@@ -6,12 +6,16 @@ from datetime import datetime
 # ==================== REGISTRATION ====================
 
 class CombinedRegistrationRequest(BaseModel):
-    """Combined one-step registration with all details"""
+    """Combined one-step registration with all details.
+
+    All field constraints are enforced here by pydantic-core (Rust), so the
+    route handler does no manual validation of its own.
+    """
     name: str = Field(..., min_length=1, max_length=100, description="Full name")
     username: str = Field(..., min_length=3, max_length=50, description="Unique username")
     password: str = Field(..., min_length=6, description="Password must be at least 6 characters")
-    phone_number: str = Field(..., min_length=10, max_length=10, description="10 digit phone number")
-    consumer_number: str = Field(..., min_length=10, max_length=13, description="10-13 digit consumer number")
+    phone_number: str = Field(..., pattern=r"^[0-9]{10}$", description="10 digit phone number")
+    consumer_number: str = Field(..., pattern=r"^[0-9]{10,13}$", description="10-13 digit consumer number")
 
 
 
@@ -27,8 +31,7 @@ class RegisterWithTokenResponse(BaseModel):
     token_type: str = "bearer"
     message: str = "Registration successful! You are now logged in."
 
-    class Config:
-        from_attributes = True
+    model_config = {"from_attributes": True}
 
 
 # ==================== LOGIN ====================
@@ -91,6 +94,5 @@ class UserProfile(BaseModel):
     is_active: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = {"from_attributes": True}
 
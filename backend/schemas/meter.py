@@ -1,6 +1,8 @@
 """
 Pydantic schemas for meter data.
 """
+from typing import List
+
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -10,6 +12,34 @@ class MeterReading(BaseModel):
     timestamp: datetime
     watts: float
 
-    class Config:
-        orm_mode = True
+    model_config = {"from_attributes": True}
+
+
+class DailyBucket(BaseModel):
+    """One pre-aggregated day for usage charts."""
+    day: str
+    total_kwh: float
+
+
+class TodayUsageResponse(BaseModel):
+    meter_id: int
+    date: str
+    total_energy_kwh: float
+    reading_count: int
+
+
+class WeeklyUsageResponse(BaseModel):
+    meter_id: int
+    period: str
+    total_energy_kwh: float
+    average_daily_kwh: float
+    reading_count: int
+    daily: List[DailyBucket]
+
+
+class MonthlyUsageResponse(BaseModel):
+    meter_id: int
+    period: str
+    total_energy_kwh: float
+    reading_count: int
 
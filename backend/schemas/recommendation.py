@@ -2,7 +2,9 @@
 schemas/recommendation.py — WattWise
 
 Pydantic response schema for the /recommendations endpoints.
-Used as response_model=List[Recommendation] in api/recommendations.py.
+Defines the GET /recommendations/ payload shape; the route builds
+instances with model_construct (values are computed server-side) rather
+than re-validating through a response_model.
 """
 
 from pydantic import BaseModel
@@ -0,0 +1,52 @@
+"""
+scripts/init_db.py — one-shot database initialization
+
+Creates the schema and runs the idempotent migrations once, so app
+workers can boot with CREATE_TABLES_ON_START=0 and skip DDL entirely.
+Intended for the container entrypoint:
+
+    python scripts/init_db.py && uvicorn main:app --workers 4
+
+On Postgres the whole run is serialized with an advisory lock, so
+concurrently starting instances can't race on DDL.
+"""
+
+import os
+import sys
+from importlib import import_module
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from db.session import engine
+from db.models import Base
+
+migrate = import_module("migrate")
+
+INIT_LOCK_KEY = 874512  # arbitrary app-wide advisory lock id
+
+
+def main():
+    lock_conn = None
+    if engine.dialect.name == "postgresql":
+        lock_conn = engine.connect()
+        lock_conn.execute(text(f"SELECT pg_advisory_lock({INIT_LOCK_KEY})"))
+
+    try:
+        Base.metadata.create_all(bind=engine)
+        migrate.migrate_users_table()
+        migrate.create_otp_table()
+        migrate.create_performance_indexes()
+        migrate.backfill_daily_rollups()
+        migrate.add_minute_of_day_column()
+    finally:
+        if lock_conn is not None:
+            lock_conn.execute(text(f"SELECT pg_advisory_unlock({INIT_LOCK_KEY})"))
+            lock_conn.close()
+
+    print("✅ Database initialized")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,89 @@
 import random
+import time
+from collections import defaultdict
 from datetime import datetime
 from zoneinfo import ZoneInfo
+from sqlalchemy import select
 from db.session import SessionLocal
-from db.models import Meter, MeterReading, Appliance
+from db.models import Meter, MeterReading, MeterDailyKwh, Appliance
 
 IST = ZoneInfo("Asia/Kolkata")
 
-def generate_reading():
-    db = SessionLocal()
 
-    meters = db.query(Meter).all()
+def _bump_daily_rollup(db, meter_id, day, energy_kwh, count=1):
+    """Fold readings into the per-meter daily rollup (app-level upsert).
+
+    The simulator is the only reading writer and runs single-threaded, so
+    UPDATE-then-INSERT is race-free here.
+    """
+    updated = db.query(MeterDailyKwh).filter(
+        MeterDailyKwh.meter_id == meter_id,
+        MeterDailyKwh.day == day,
+    ).update({
+        MeterDailyKwh.total_kwh: MeterDailyKwh.total_kwh + energy_kwh,
+        MeterDailyKwh.reading_count: MeterDailyKwh.reading_count + count,
+    }, synchronize_session=False)
+    if not updated:
+        db.add(MeterDailyKwh(
+            meter_id=meter_id, day=day,
+            total_kwh=energy_kwh, reading_count=count,
+        ))
+
+
+# Meters only change on registration, so the per-tick SELECT is cached for
+# a minute. Appliances are NOT cached — is_on toggles drive the load curve
+# and must be fresh every tick.
+METER_TTL_SECONDS = 60
+
+_meter_cache = []       # list of (meter_id, user_id) tuples
+_meter_cache_expiry = 0.0
+
+
+def _get_meters(db):
+    """(meter_id, user_id) pairs, refreshed at most once per TTL."""
+    global _meter_cache, _meter_cache_expiry
+
+    now = time.monotonic()
+    if now >= _meter_cache_expiry:
+        _meter_cache = db.execute(select(Meter.id, Meter.user_id)).all()
+        _meter_cache_expiry = now + METER_TTL_SECONDS
+    return _meter_cache
+
+
+# Coalesce commits: one flush (bulk INSERT + fsync) per N ticks instead of
+# one commit per 15-second tick. Kept small so the live dashboard stays
+# within its polling staleness budget.
+FLUSH_EVERY_TICKS = 2
+
+_pending = []   # queued reading dicts awaiting the next flush
+_ticks = 0
+
+
+def make_readings(db):
+    """Compute one tick of readings for every meter (no writes).
+
+    Returns a list of mapping dicts ready for bulk_insert_mappings.
+    Plain dicts on purpose: the data is generated here, so validating it
+    through a Pydantic schema (even model_construct) or instantiating ORM
+    objects would be pure overhead in the per-tick path.
+    """
+    meters = _get_meters(db)
     if not meters:
-        db.close()
-        return
+        return []
 
     readings = []
     current_time = datetime.now(IST)
 
-    for meter in meters:
-        # Get user's active appliances to calculate real load
-        appliances = db.query(Appliance).filter(Appliance.user_id == meter.user_id).all()
-        
+    # One query for every user's appliances instead of one per meter
+    apps_by_user = defaultdict(list)
+    for app in db.execute(
+        select(Appliance.user_id, Appliance.power_kw, Appliance.is_on)
+    ).all():
+        apps_by_user[app.user_id].append(app)
+
+    for meter_id, user_id in meters:
+        appliances = apps_by_user.get(user_id, [])
+
         active_load_kw = 0.0
         
         # Base load logic:
@@ -46,12 +109,52 @@ def generate_reading():
         # Calculate energy for 15 minutes (0.25 hours)
         energy_kwh = round(total_load_kw * 0.25, 3)
 
-        readings.append(MeterReading(
-            meter_id=meter.id,
-            timestamp=current_time,
-            energy_kwh=energy_kwh
-        ))
+        readings.append({
+            "meter_id": meter_id,
+            "timestamp": current_time,
+            "energy_kwh": energy_kwh,
+            "minute_of_day": current_time.hour * 60 + current_time.minute,
+        })
+
+    return readings
+
 
-    db.add_all(readings)
+def flush(db):
+    """Bulk-insert queued readings and fold them into the daily rollups."""
+    if not _pending:
+        return
+
+    # Aggregate per (meter, day) first so each rollup row gets exactly one
+    # upsert per flush regardless of how many ticks were queued
+    rollups = defaultdict(lambda: [0.0, 0])
+    for r in _pending:
+        agg = rollups[(r["meter_id"], r["timestamp"].date())]
+        agg[0] += r["energy_kwh"]
+        agg[1] += 1
+    for (meter_id, day), (kwh, count) in rollups.items():
+        _bump_daily_rollup(db, meter_id, day, kwh, count)
+
+    db.bulk_insert_mappings(MeterReading, _pending)
     db.commit()
-    db.close()
+    _pending.clear()
+
+
+def generate_reading(db=None):
+    """Queue one tick of readings; flush every FLUSH_EVERY_TICKS ticks.
+
+    The simulator loop passes its long-lived session; callers without one
+    (scripts, tests) get a session per call.
+    """
+    global _ticks
+
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
+    try:
+        _pending.extend(make_readings(db))
+        _ticks += 1
+        if _ticks % FLUSH_EVERY_TICKS == 0:
+            flush(db)
+    finally:
+        if owns_session:
+            db.close()
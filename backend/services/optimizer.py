@@ -18,15 +18,21 @@ can_use_now() — upgraded to use IST and simulate_cost().
 """
 
 import datetime
+from collections import namedtuple
+from functools import lru_cache
 from math import sin, pi
 from typing import List, Tuple
 from zoneinfo import ZoneInfo
 
+import numpy as np
+
 from services.tariff_service import (
     simulate_cost,
     find_cheapest_slot,
     get_price_for_timestamp,
     now_ist,
+    build_price_grid,
+    slot_costs,
 )
 
 IST = ZoneInfo("Asia/Kolkata")
@@ -37,24 +43,14 @@ IST = ZoneInfo("Asia/Kolkata")
 #  Kept here as it's an optimizer concern (eco scoring), not a tariff concern.
 # --------------------------------------------------------------------------- #
 
-def _grid_load(hour: int) -> float:
-    """
-    Simulate grid demand using a sinusoidal curve.
-    Peaks around 19:00 (7 PM), lowest around 03:00 (3 AM).
-    Returns value between 0.1 and 0.9.
-    """
-    h    = hour % 24
+def _grid_load_curve(h: int) -> float:
+    """Sinusoidal grid demand: peaks ~19:00, lowest ~03:00, range 0.1–0.9."""
     load = 0.5 + 0.4 * sin(pi * (h - 6) / 12)
     return round(max(0.1, min(0.9, load)), 3)
 
 
-def _time_preference(hour: int) -> float:
-    """
-    Scheduling convenience score.
-    Favours late-night / early-morning for background/automated runs.
-    Returns 0.0 – 1.0.
-    """
-    h = hour % 24
+def _time_preference_curve(h: int) -> float:
+    """Scheduling convenience: favours late-night/early-morning runs."""
     if 22 <= h or h < 6:
         return 1.0   # best — off-peak, user asleep, ideal for automation
     elif 6 <= h < 9:
@@ -64,6 +60,26 @@ def _time_preference(hour: int) -> float:
     return 0.5       # neutral daytime
 
 
+# Both curves are pure functions of hour-of-day and sit inside the
+# 96-slot scoring loop — tabulate them once at import.
+_GRID_LOAD_LUT = tuple(_grid_load_curve(h) for h in range(24))
+_TIME_PREF_LUT = tuple(_time_preference_curve(h) for h in range(24))
+
+# Array views of the same LUTs for the vectorized scoring kernel
+_GRID_LOAD_ARR = np.array(_GRID_LOAD_LUT)
+_TIME_PREF_ARR = np.array(_TIME_PREF_LUT)
+
+
+def _grid_load(hour: int) -> float:
+    """Grid demand estimate for the hour (0.1–0.9); see _grid_load_curve."""
+    return _GRID_LOAD_LUT[hour % 24]
+
+
+def _time_preference(hour: int) -> float:
+    """Scheduling convenience score 0.0–1.0; see _time_preference_curve."""
+    return _TIME_PREF_LUT[hour % 24]
+
+
 def _weighted_score(avg_cost: float, hour: int) -> float:
     """
     Weighted score formula combining cost, grid load, and preference.
@@ -82,6 +98,30 @@ def _weighted_score(avg_cost: float, hour: int) -> float:
     )
 
 
+def _score_all_slots(costs_raw: np.ndarray, duration_minutes: int):
+    """
+    Numeric kernel of the 96-slot scan: rounded per-slot cost and weighted
+    score as arrays, no Python-level per-slot work.
+
+    Applies _weighted_score to every slot at once (both curves keyed on
+    the run's midpoint hour, 0.01 floor on zero costs), so the caller
+    only materializes dicts for the top-N winners instead of all 96
+    candidates.
+    """
+    start_min = np.arange(len(costs_raw)) * 15
+    avg_cost  = np.round(costs_raw, 2)
+    safe_cost = np.where(avg_cost > 0, avg_cost, 0.01)
+    mid_hour  = ((start_min + duration_minutes // 2) // 60) % 24
+
+    score = np.round(
+        0.6 / safe_cost
+        + 0.3 * (1 - _GRID_LOAD_ARR[mid_hour])
+        + 0.1 * _TIME_PREF_ARR[mid_hour],
+        4,
+    )
+    return avg_cost, score
+
+
 # --------------------------------------------------------------------------- #
 #  Original signature — preserved for backward compatibility
 #  Now delegates to tariff_service.find_cheapest_slot internally.
@@ -108,19 +148,70 @@ def find_cheapest_windows(
         return []
 
     window_steps = max(1, window_minutes // 60)
-    results      = []
+    n_windows    = len(tariffs) - window_steps + 1
+    if n_windows <= 0:
+        return []
 
-    for i in range(len(tariffs) - window_steps + 1):
-        window   = tariffs[i : i + window_steps]
-        avg_rate = sum(p for _, p in window) / len(window)
-        start_dt = window[0][0]
-        end_dt   = window[-1][0] + datetime.timedelta(hours=1)
-        # Cost assumes 1 kW — caller scales by appliance power_kw
-        cost     = round(avg_rate * window_steps, 2)
-        results.append((start_dt, end_dt, cost))
+    # All window sums in one prefix-sum pass instead of re-summing each
+    # rolling window in Python
+    prices = np.fromiter((p for _, p in tariffs), dtype=np.float64, count=len(tariffs))
+    csum   = np.concatenate(([0.0], np.cumsum(prices)))
+    sums   = csum[window_steps:] - csum[:-window_steps]
+    # Cost assumes 1 kW — caller scales by appliance power_kw
+    costs  = np.round(sums / window_steps * window_steps, 2)
 
-    results.sort(key=lambda x: x[2])
-    return results
+    hour = datetime.timedelta(hours=1)
+    # Stable argsort keeps the earlier start first on equal-cost windows,
+    # matching the previous list.sort ordering
+    return [
+        (tariffs[i][0], tariffs[i + window_steps - 1][0] + hour, float(costs[i]))
+        for i in np.argsort(costs, kind="stable")
+    ]
+
+
+# --------------------------------------------------------------------------- #
+#  Memoized day scans
+#
+#  Dashboards call the recommenders once per appliance, and appliances of
+#  the same wattage/duration repeat the identical 24-hour scan. The scans
+#  are pure functions of (tariff slabs, power, duration), so they are
+#  memoized keyed on the slab snapshot tuple — a tariff change produces a
+#  new key, which makes the cache self-invalidating.
+# --------------------------------------------------------------------------- #
+
+_Slab = namedtuple("_Slab", "start_time end_time price_per_unit")
+
+
+def _tariff_key(tariff_rows: list) -> tuple:
+    """Hashable snapshot of the slabs, usable as a cache key."""
+    return tuple((r.start_time, r.end_time, r.price_per_unit) for r in tariff_rows)
+
+
+@lru_cache(maxsize=128)
+def _slot_cost_table(tariff_key: tuple, power_kw: float, duration_minutes: int):
+    """Cost of every 15-min start slot; treat the returned array as read-only."""
+    rows = [_Slab(*t) for t in tariff_key]
+    return slot_costs(power_kw, duration_minutes, build_price_grid(rows))
+
+
+@lru_cache(maxsize=128)
+def _best_full_day_slot(tariff_key: tuple, power_kw: float, duration_minutes: int) -> tuple:
+    """(recommended_start, expected_cost) of the cheapest full-day slot.
+
+    Only the time-independent fields are cached — savings_vs_now from
+    find_cheapest_slot depends on the current clock and is recomputed by
+    callers that need it.
+    """
+    rows = [_Slab(*t) for t in tariff_key]
+    best = find_cheapest_slot(
+        power_kw         = power_kw,
+        duration_minutes = duration_minutes,
+        window_start_str = "00:00",
+        window_end_str   = "23:45",
+        tariff_rows      = rows,
+        step_minutes     = 15,
+    )
+    return best["recommended_start"], best["expected_cost"]
 
 
 # --------------------------------------------------------------------------- #
@@ -138,9 +229,11 @@ def sliding_window_recommend(
     Slides a window of `duration_hrs` across the full 24-hour day in
     15-minute steps. Each candidate slot is scored using the weighted formula.
 
-    Cost is computed via simulate_cost() which steps in 15-min chunks —
-    so appliances crossing a tariff slab boundary (e.g. 21:30–22:30)
-    are priced accurately for each chunk, not averaged.
+    All 96 candidate costs come out of one slot_costs() prefix-sum pass
+    over the precomputed price grid — the exact totals simulate_cost()
+    would produce per slot, without 96 chunk-stepping slab scans. The
+    peak reference cost (19:00 start) is computed once, not per
+    candidate.
 
     Args:
         power_kw     : appliance wattage in kW (from Appliance.power_kw)
@@ -152,46 +245,42 @@ def sliding_window_recommend(
         list of dicts sorted by score descending, length = top_n
     """
     duration_minutes = round(duration_hrs * 60)
-    today            = now_ist().date()
-    results          = []
 
-    # Slide in 15-min steps across 24 hours
-    cursor   = datetime.datetime(today.year, today.month, today.day, 0, 0, tzinfo=IST)
-    end_scan = cursor + datetime.timedelta(hours=24)
+    costs_raw   = _slot_cost_table(_tariff_key(tariff_rows), power_kw, duration_minutes)
+    energy_used = round(power_kw * duration_minutes / 60, 3)
 
-    while cursor < end_scan:
-        t_str  = cursor.strftime("%H:%M")
-        end_dt = cursor + datetime.timedelta(minutes=duration_minutes)
+    # Peak cost = running at the most expensive slab (for savings calc)
+    peak_cost = round(float(costs_raw[(19 * 60) // 15]), 2)
 
-        # Accurate cost via simulate_cost (handles slab boundary crossings)
-        sim       = simulate_cost(power_kw, duration_minutes, t_str, tariff_rows)
-        avg_cost  = sim["cost"]
-        avg_rate  = sim["price_per_unit"]
-        mid_dt    = cursor + datetime.timedelta(minutes=duration_minutes // 2)
-        score     = _weighted_score(avg_cost if avg_cost > 0 else 0.01, mid_dt.hour)
+    # Costs and scores for all 96 slots in one kernel pass; dicts are only
+    # built for the winners. Stable argsort keeps the earlier slot first on
+    # ties, matching the previous stable sort over the full list.
+    avg_costs, scores = _score_all_slots(np.asarray(costs_raw), duration_minutes)
+    order = np.argsort(-scores, kind="stable")[:top_n]
 
-        # Peak cost = running at the most expensive slab (for savings calc)
-        peak_sim  = simulate_cost(power_kw, duration_minutes, "19:00", tariff_rows)
-        savings   = round(max(0.0, peak_sim["cost"] - avg_cost), 2)
+    top = []
+    for rank, i in enumerate(order):
+        start_min = int(i) * 15
+        end_min   = (start_min + duration_minutes) % 1440
+        t_str     = f"{start_min // 60:02d}:{start_min % 60:02d}"
+        end_str   = f"{end_min // 60:02d}:{end_min % 60:02d}"
 
-        results.append({
+        avg_cost = float(avg_costs[i])
+        avg_rate = round(float(costs_raw[i]) / energy_used, 2) if energy_used > 0 else 6.0
+
+        slot = {
             "start_time"          : t_str,
-            "end_time"            : end_dt.strftime("%H:%M"),
-            "slot_label"          : f"{t_str} – {end_dt.strftime('%H:%M')}",
+            "end_time"            : end_str,
+            "slot_label"          : f"{t_str} – {end_str}",
             "avg_tariff"          : avg_rate,
             "estimated_cost_inr"  : avg_cost,
-            "savings_vs_peak_inr" : savings,
-            "grid_load"           : _grid_load(cursor.hour),
-            "score"               : score,
-        })
-
-        cursor += datetime.timedelta(minutes=15)
-
-    # Sort by score descending, return top N
-    top = sorted(results, key=lambda x: -x["score"])[:top_n]
-    for i, s in enumerate(top):
-        s["rank"]   = i + 1
-        s["reason"] = _build_reason(s, i)
+            "savings_vs_peak_inr" : round(max(0.0, peak_cost - avg_cost), 2),
+            "grid_load"           : _grid_load(start_min // 60),
+            "score"               : float(scores[i]),
+            "rank"                : rank + 1,
+        }
+        slot["reason"] = _build_reason(slot, rank)
+        top.append(slot)
 
     return top
 
@@ -229,17 +318,11 @@ def can_use_now(
     now_sim  = simulate_cost(power_kw, duration_minutes, now_str, tariff_rows)
     now_cost = now_sim["cost"]
 
-    # Best slot across full 24 hours via sliding window
-    best = find_cheapest_slot(
-        power_kw         = power_kw,
-        duration_minutes = duration_minutes,
-        window_start_str = "00:00",
-        window_end_str   = "23:45",
-        tariff_rows      = tariff_rows,
-        step_minutes     = 15,
+    # Best slot across full 24 hours via the memoized sliding-window scan
+    best_start, best_cost = _best_full_day_slot(
+        _tariff_key(tariff_rows), power_kw, duration_minutes
     )
 
-    best_cost        = best["expected_cost"]
     savings_possible = round(max(0.0, now_cost - best_cost), 2)
     is_good          = now_cost <= best_cost * 1.15  # within 15% = green light
 
@@ -248,13 +331,13 @@ def can_use_now(
         "current_time_ist"           : now_str,
         "current_tariff"             : get_price_for_timestamp(now, tariff_rows),
         "current_estimated_cost_inr" : now_cost,
-        "best_slot_start"            : best["recommended_start"],
+        "best_slot_start"            : best_start,
         "best_slot_cost_inr"         : best_cost,
         "savings_if_you_wait_inr"    : savings_possible,
         "recommendation"             : (
             "✅ Good time! Tariff is near its daily low."
             if is_good else
-            f"⏳ Wait until {best['recommended_start']} — save ₹{savings_possible}"
+            f"⏳ Wait until {best_start} — save ₹{savings_possible}"
         ),
     }
 
@@ -0,0 +1,35 @@
+"""
+services/summary_cache.py — WattWise Dashboard Summary Cache
+
+The dashboard is polled far more often than its inputs change (meter
+readings arrive on a 15-second cadence), so the fully-built
+/dashboard/summary payload is cached per user for a short TTL instead of
+re-running its four SELECTs on every poll.
+
+Appliance toggles call invalidate() so the active-device count never
+shows stale data; everything else simply ages out within the TTL.
+"""
+
+import time
+
+TTL_SECONDS = 30
+
+_cache = {}  # user_id -> (cached_at, payload)
+
+
+def get(user_id: int):
+    """Return the cached summary payload for a user, or None if stale/absent."""
+    entry = _cache.get(user_id)
+    if entry and time.time() - entry[0] < TTL_SECONDS:
+        return entry[1]
+    return None
+
+
+def put(user_id: int, payload: dict) -> None:
+    """Cache the freshly built summary payload for a user."""
+    _cache[user_id] = (time.time(), payload)
+
+
+def invalidate(user_id: int) -> None:
+    """Drop a user's cached summary (called when an appliance toggles)."""
+    _cache.pop(user_id, None)
@@ -0,0 +1,94 @@
+"""
+services/tariff_cache.py — WattWise In-Process Tariff Cache
+
+Tariff slabs change rarely (regulatory updates, not per-request), yet every
+dashboard/recommendation hit was re-running `db.query(Tariff).all()`.
+This module keeps the rows in a module-level cache with a short TTL so the
+SELECT and ORM instantiation happen at most once per TTL window per process.
+
+A monotonically increasing version stamp is bumped whenever the cached rows
+actually change (not on every TTL refresh), so derived structures — price
+lookup tables, precomputed slot grids — can be keyed on get_version() and
+rebuilt only when tariffs really changed.
+
+Call invalidate() after any tariff write so the next read refetches.
+"""
+
+import threading
+import time
+
+from sqlalchemy import select
+
+from db.models import Tariff
+from services.tariff_service import build_minute_price_lut, build_price_grid
+
+TTL_SECONDS = 300  # tariffs change rarely; 5 min staleness is acceptable
+
+_cache = {"rows": None, "ts": 0.0, "snapshot": None, "version": 0}
+_grid_cache = {"version": None, "grid": None}
+_lut_cache = {"version": None, "lut": None}
+# Sync endpoints run in Starlette's threadpool, so refreshes can race;
+# double-checked locking keeps the hot (cached) path lock-free.
+_lock = threading.Lock()
+
+
+def get_tariff_rows(db, ttl: float = TTL_SECONDS) -> list:
+    """Return all tariff rows, refetching from the DB at most once per TTL.
+
+    Rows are plain column Rows (attribute access, no identity map or
+    session bookkeeping) — a pure read needs no ORM instances, and it
+    keeps the cached rows free of any session-lifetime concerns.
+    """
+    now = time.time()
+    if _cache["rows"] is None or now - _cache["ts"] > ttl:
+        with _lock:
+            # Re-check under the lock: another thread may have refreshed
+            # while we waited.
+            if _cache["rows"] is None or now - _cache["ts"] > ttl:
+                rows = db.execute(
+                    select(Tariff.start_time, Tariff.end_time, Tariff.price_per_unit)
+                ).all()
+                snapshot = [(t.start_time, t.end_time, t.price_per_unit) for t in rows]
+                if snapshot != _cache["snapshot"]:
+                    _cache["version"] += 1
+                    _cache["snapshot"] = snapshot
+                _cache["rows"] = rows
+                _cache["ts"] = now
+    return _cache["rows"]
+
+
+def get_price_grid(db):
+    """96-entry per-slot price grid, rebuilt only when tariffs change.
+
+    Callers that scan the day (recommendations, comparisons) share this
+    precomputed grid instead of re-deriving slab prices per request.
+    """
+    rows = get_tariff_rows(db)
+    if _grid_cache["version"] != _cache["version"]:
+        _grid_cache["grid"] = build_price_grid(rows)
+        _grid_cache["version"] = _cache["version"]
+    return _grid_cache["grid"]
+
+
+def get_minute_lut(db):
+    """1440-entry per-minute price LUT, rebuilt only when tariffs change.
+
+    Turns 'what does a unit cost at HH:MM' into lut[h*60+m] — one array
+    read instead of a slab scan with overnight-wrap branches.
+    """
+    rows = get_tariff_rows(db)
+    if _lut_cache["version"] != _cache["version"]:
+        _lut_cache["lut"] = build_minute_price_lut(rows)
+        _lut_cache["version"] = _cache["version"]
+    return _lut_cache["lut"]
+
+
+def get_version() -> int:
+    """Version stamp of the cached rows; changes only when tariffs change."""
+    return _cache["version"]
+
+
+def invalidate() -> None:
+    """Drop the cached rows so the next get_tariff_rows() hits the DB."""
+    _cache["rows"] = None
+    _cache["ts"] = 0.0
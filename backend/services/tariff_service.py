@@ -16,6 +16,8 @@ to avoid repeated hits.
 import datetime
 from zoneinfo import ZoneInfo
 
+import numpy as np
+
 IST = ZoneInfo("Asia/Kolkata")
 
 
@@ -56,8 +58,21 @@ def get_price_for_timestamp(
     else:
         dt = dt.astimezone(IST)
 
-    t = dt.time()
+    return _price_for_time(dt.time(), tariff_rows)
+
+
+def _to_minute(s: str) -> int:
+    """Parse 'HH:MM' to minute-of-day with two int() slices.
+
+    Avoids strptime (regex-backed) and the throwaway datetime it would
+    build — the callers want the integer LUT index anyway. Raises
+    ValueError on malformed input, same as the parsing it replaces.
+    """
+    return int(s[:2]) * 60 + int(s[3:5])
+
 
+def _price_for_time(t: datetime.time, tariff_rows: list) -> float:
+    """Slab lookup for a bare time-of-day (already IST)."""
     for row in tariff_rows:
         s = row.start_time
         e = row.end_time
@@ -74,6 +89,87 @@ def get_price_for_timestamp(
     return 6.0  # safe default if DB has no matching slab
 
 
+# --------------------------------------------------------------------------- #
+#  Vectorized price grid + slot-cost kernel
+# --------------------------------------------------------------------------- #
+
+def build_minute_price_lut(tariff_rows: list) -> np.ndarray:
+    """
+    Price per unit for every minute of the day as a 1440-entry NumPy array.
+
+    Flattens the slab list (including the overnight wrap) into a contiguous
+    array indexed by minute-of-day, so any price lookup is one array read
+    instead of a branchy interval scan. Rows are applied in reverse so that
+    where slabs overlap the first row wins, matching _price_for_time().
+    """
+    lut = np.full(1440, 6.0)  # same fallback as _price_for_time
+    for row in reversed(tariff_rows):
+        s = row.start_time.hour * 60 + row.start_time.minute
+        e = row.end_time.hour * 60 + row.end_time.minute
+        if s < e:
+            lut[s:e] = row.price_per_unit
+        else:
+            # Overnight slab crossing midnight
+            lut[s:] = row.price_per_unit
+            lut[:e] = row.price_per_unit
+    return lut
+
+
+def build_price_grid(tariff_rows: list, step_minutes: int = 15) -> np.ndarray:
+    """
+    Price per unit at every step of the day as a NumPy array.
+
+    Entry i holds the tariff price at minute i × step_minutes. With the
+    default 15-min step that is 96 entries — one per recommendation slot.
+    Built once per request (or cached), then reused by slot_costs() so a
+    full-day scan does zero datetime/slab lookups per slot.
+    """
+    return build_minute_price_lut(tariff_rows)[::step_minutes].copy()
+
+
+def slot_costs(
+    power_kw: float,
+    duration_minutes: int,
+    price_grid: np.ndarray,
+    step_minutes: int = 15,
+) -> np.ndarray:
+    """
+    Cost of starting a run at every slot of the day, fully vectorized.
+
+    Produces exactly what calling simulate_cost() for each of the day's
+    slots would: full step-sized chunks priced at their slot's tariff plus
+    a shorter remainder chunk, with runs past midnight wrapping onto the
+    same day's prices. Implemented as a prefix-sum over a doubled price
+    grid — one O(N) pass instead of N × (duration/step) slab lookups.
+
+    Non-positive durations cost zero (matching the chunk-stepping loop,
+    which simply never ran); durations beyond 24 hours peel off whole-day
+    cycles first — a full cycle costs the same from any start — so the
+    windowed remainder always fits within one doubled grid.
+
+    Returns:
+        np.ndarray of length len(price_grid), cost in ₹ per candidate start.
+    """
+    n = len(price_grid)
+    if duration_minutes <= 0:
+        return np.zeros(n)
+
+    full_days, duration_minutes = divmod(duration_minutes, n * step_minutes)
+    full_chunks, remainder = divmod(duration_minutes, step_minutes)
+
+    # Double the grid so windows that cross midnight stay contiguous
+    tiled = np.concatenate((price_grid, price_grid))
+    prefix = np.concatenate(([0.0], np.cumsum(tiled)))
+
+    step_hours = step_minutes / 60.0
+    costs = power_kw * step_hours * (prefix[full_chunks:full_chunks + n] - prefix[:n])
+    if remainder:
+        costs = costs + power_kw * (remainder / 60.0) * tiled[full_chunks:full_chunks + n]
+    if full_days:
+        costs = costs + full_days * power_kw * step_hours * float(prefix[n])
+    return costs
+
+
 # --------------------------------------------------------------------------- #
 #  FEATURE 1 — Current tariff
 # --------------------------------------------------------------------------- #
@@ -132,31 +228,103 @@ def get_full_schedule(tariff_rows: list) -> list:
 #  FEATURE 4 — Today's bill
 # --------------------------------------------------------------------------- #
 
-def calculate_today_cost(meter_readings: list, tariff_rows: list) -> dict:
+def calculate_today_cost(meter_readings: list, tariff_rows: list, price_lut=None) -> dict:
     """
-    Sum up cost of all meter readings from today (IST).
+    Sum up cost of all meter readings from today (IST), vectorized.
 
-    For each reading:
-        cost += energy_kwh × tariff_price_at(reading.timestamp)
+    Per-reading prices are gathered from the 1440-minute LUT in one NumPy
+    indexing op instead of a Python loop of slab lookups. Timestamps are
+    the IST-naive values the readings are stored with.
 
     Args:
-        meter_readings : list of MeterReading ORM objects (today's only).
+        meter_readings : rows with .timestamp / .energy_kwh (ORM objects or
+                         column tuples — tuples skip ORM overhead).
         tariff_rows    : list of Tariff ORM objects.
+        price_lut      : optional precomputed per-minute LUT (see
+                         services.tariff_cache.get_minute_lut); derived
+                         from tariff_rows when absent.
 
     Returns:
         {"today_kwh": float, "today_cost": float}
     """
-    total_kwh  = 0.0
-    total_cost = 0.0
+    if not meter_readings:
+        return {"today_kwh": 0.0, "today_cost": 0.0}
 
-    for reading in meter_readings:
-        price       = get_price_for_timestamp(reading.timestamp, tariff_rows)
-        total_kwh  += reading.energy_kwh
-        total_cost += reading.energy_kwh * price
+    if price_lut is None:
+        price_lut = build_minute_price_lut(tariff_rows)
+
+    n = len(meter_readings)
+    minutes = np.fromiter(
+        (r.timestamp.hour * 60 + r.timestamp.minute for r in meter_readings),
+        dtype=np.int32, count=n,
+    )
+    energy = np.fromiter(
+        (r.energy_kwh for r in meter_readings), dtype=np.float64, count=n,
+    )
 
     return {
-        "today_kwh" : round(total_kwh, 3),
-        "today_cost": round(total_cost, 2),
+        "today_kwh" : round(float(energy.sum()), 3),
+        "today_cost": round(float((energy * price_lut[minutes]).sum()), 2),
+    }
+
+
+def aggregate_today_cost(db, price_lut, today_start, user_id=None) -> dict:
+    """
+    Today's bill with the per-reading aggregation pushed into SQL.
+
+    Energy is summed per minute-of-day in the database, so at most 1440
+    tiny (minute, kwh) rows cross the wire no matter how many readings
+    accumulated — the full rows never get transferred or materialized.
+    The buckets are then priced with the same per-minute LUT as
+    calculate_today_cost(), keeping slab precedence identical.
+
+    New readings carry a denormalized minute_of_day column, so the
+    grouping is on a plain indexed integer; rows written before that
+    column existed fall back to extracting the minute from the timestamp
+    (EXTRACT on Postgres, strftime on the SQLite databases used in
+    dev/tests).
+
+    Args:
+        db          : SQLAlchemy session.
+        price_lut   : per-minute price LUT (services.tariff_cache.get_minute_lut).
+        today_start : midnight IST as a naive datetime.
+        user_id     : optionally restrict to one user's meters.
+
+    Returns:
+        {"today_kwh": float, "today_cost": float}
+    """
+    from sqlalchemy import Integer, cast, func, select
+    from db.models import Meter, MeterReading
+
+    ts = MeterReading.timestamp
+    if db.get_bind().dialect.name == "postgresql":
+        extracted = func.extract("hour", ts) * 60 + func.extract("minute", ts)
+    else:
+        extracted = (
+            cast(func.strftime("%H", ts), Integer) * 60
+            + cast(func.strftime("%M", ts), Integer)
+        )
+    minute = func.coalesce(MeterReading.minute_of_day, extracted)
+
+    # Half-open day range — sargable on both ends, so the planner can walk
+    # the (meter_id, timestamp) / timestamp btrees instead of scanning
+    stmt = (
+        select(minute.label("minute"), func.sum(MeterReading.energy_kwh))
+        .where(ts >= today_start, ts < today_start + datetime.timedelta(days=1))
+        .group_by("minute")
+    )
+    if user_id is not None:
+        stmt = stmt.join(Meter).where(Meter.user_id == user_id)
+    rows = db.execute(stmt).all()
+    if not rows:
+        return {"today_kwh": 0.0, "today_cost": 0.0}
+
+    minutes = np.fromiter((int(m) for m, _ in rows), dtype=np.int32, count=len(rows))
+    energy  = np.fromiter((e for _, e in rows), dtype=np.float64, count=len(rows))
+
+    return {
+        "today_kwh" : round(float(energy.sum()), 3),
+        "today_cost": round(float((energy * price_lut[minutes]).sum()), 2),
     }
 
 
@@ -164,57 +332,69 @@ def calculate_today_cost(meter_readings: list, tariff_rows: list) -> dict:
 #  FEATURE 5 — Cost simulation
 # --------------------------------------------------------------------------- #
 
+def _simulate_cost_min(
+    power_kw: float,
+    duration_minutes: int,
+    start_min: int,           # minute-of-day 0–1439
+    price_lut: np.ndarray,
+) -> dict:
+    """
+    Integer-minute core of simulate_cost().
+
+    Prices the run in 15-minute chunks at each chunk's start-minute price
+    (the same semantics as the original datetime-stepping loop), but the
+    prices come straight out of the 1440-minute LUT — no datetimes, no
+    "HH:MM" round-trips, no per-chunk slab scans. Runs crossing midnight
+    wrap onto the same day's prices via the mod-1440 index.
+    """
+    if duration_minutes <= 0:
+        return {"energy_used": 0.0, "cost": 0.0, "price_per_unit": 6.0}
+
+    offsets = np.arange(0, duration_minutes, 15)
+    chunks  = np.minimum(15.0, duration_minutes - offsets)
+    prices  = price_lut[(start_min + offsets) % 1440]
+
+    total_cost  = float(power_kw / 60.0 * (chunks @ prices))
+    energy_used = round(power_kw * duration_minutes / 60, 3)
+    avg_price   = round(total_cost / energy_used, 2) if energy_used > 0 else float(prices[-1])
+
+    return {
+        "energy_used"    : energy_used,
+        "cost"           : round(total_cost, 2),
+        "price_per_unit" : avg_price,
+    }
+
+
 def simulate_cost(
     power_kw: float,
     duration_minutes: int,
     start_time_str: str,      # "HH:MM"
     tariff_rows: list,
+    price_lut: np.ndarray = None,
 ) -> dict:
     """
     Simulate cost of running an appliance at a specific start time.
 
-    Uses today's date in IST with the given start_time to build a datetime,
-    then looks up the tariff. Handles appliances that run across slab boundaries
-    by stepping in 15-minute intervals.
+    Thin wrapper over _simulate_cost_min(): parses "HH:MM" once to a
+    minute-of-day index and delegates to the LUT-based kernel. Handles
+    appliances that run across slab boundaries by stepping in 15-minute
+    intervals.
 
     Args:
         power_kw         : appliance wattage in kW
         duration_minutes : how long it runs
         start_time_str   : "HH:MM" in IST
         tariff_rows      : list of Tariff ORM objects
+        price_lut        : optional precomputed per-minute LUT (see
+                           services.tariff_cache.get_minute_lut); derived
+                           from tariff_rows when absent.
 
     Returns:
         {"energy_used": float, "cost": float, "price_per_unit": float}
     """
-    h, m     = map(int, start_time_str.split(":"))
-    today    = datetime.datetime.now(tz=IST).date()
-    start_dt = datetime.datetime(today.year, today.month, today.day, h, m, tzinfo=IST)
-
-    # Step through in 15-min intervals for accuracy across slab boundaries
-    step_minutes = 15
-    total_cost   = 0.0
-    elapsed      = 0
-    last_price   = 6.0
-
-    while elapsed < duration_minutes:
-        chunk   = min(step_minutes, duration_minutes - elapsed)
-        current = start_dt + datetime.timedelta(minutes=elapsed)
-        price   = get_price_for_timestamp(current, tariff_rows)
-        energy  = power_kw * (chunk / 60)
-        total_cost += energy * price
-        last_price  = price
-        elapsed    += chunk
-
-    energy_used = round(power_kw * duration_minutes / 60, 3)
-
-    # Effective average price
-    avg_price = round(total_cost / energy_used, 2) if energy_used > 0 else last_price
-
-    return {
-        "energy_used"    : energy_used,
-        "cost"           : round(total_cost, 2),
-        "price_per_unit" : avg_price,
-    }
+    if price_lut is None:
+        price_lut = build_minute_price_lut(tariff_rows)
+    return _simulate_cost_min(power_kw, duration_minutes, _to_minute(start_time_str), price_lut)
 
 
 # --------------------------------------------------------------------------- #
@@ -227,15 +407,19 @@ def find_cheapest_slot(
     window_start_str: str,   # "HH:MM"
     window_end_str: str,     # "HH:MM"
     tariff_rows: list,
-    step_minutes: int = 15,  # granularity of sliding window
+    step_minutes: int = 1,   # granularity of sliding window
 ) -> dict:
     """
-    Sliding Window algorithm to find the cheapest continuous time slot
-    within a given search window.
+    Find the cheapest continuous time slot within a search window using a
+    prefix-sum sliding window over the per-minute price LUT.
+
+    Cost integrals for every candidate start are csum[start + D] -
+    csum[start], so the whole scan is two vectorized ops instead of a
+    Python loop of per-candidate simulations. That also makes 1-minute
+    resolution free — the default step is now 1 (it used to be 15).
 
-    The window itself can cross midnight (e.g. 18:00 – 06:00).
-    Each candidate start is stepped by `step_minutes`.
-    Each candidate is evaluated by simulate_cost().
+    The window itself can cross midnight (e.g. 18:00 – 06:00); wrapping is
+    handled by doubling the LUT.
 
     Args:
         power_kw          : appliance wattage in kW
@@ -243,32 +427,24 @@ def find_cheapest_slot(
         window_start_str  : search window start "HH:MM"
         window_end_str    : search window end "HH:MM"
         tariff_rows       : list of Tariff ORM objects
-        step_minutes      : how many minutes to slide each step (default 15)
+        step_minutes      : how many minutes to slide each step (default 1)
 
     Returns:
         {"recommended_start": "HH:MM", "expected_cost": float, "savings_vs_now": float}
     """
-    today = datetime.datetime.now(tz=IST).date()
-
-    def parse_dt(time_str: str, base_date) -> datetime.datetime:
-        h, m = map(int, time_str.split(":"))
-        return datetime.datetime(base_date.year, base_date.month, base_date.day, h, m, tzinfo=IST)
+    lut   = build_minute_price_lut(tariff_rows)
+    tiled = np.concatenate((lut, lut))
+    csum  = np.concatenate(([0.0], np.cumsum(tiled)))
 
-    win_start = parse_dt(window_start_str, today)
-    win_end   = parse_dt(window_end_str, today)
+    win_start = _to_minute(window_start_str)
+    win_end   = _to_minute(window_end_str)
 
     # Handle overnight window (e.g. 18:00 – 06:00 next day)
     if win_end <= win_start:
-        win_end += datetime.timedelta(days=1)
+        win_end += 24 * 60
 
-    # Build all candidate start times within the window
-    candidates = []
-    cursor = win_start
-    while cursor + datetime.timedelta(minutes=duration_minutes) <= win_end:
-        candidates.append(cursor)
-        cursor += datetime.timedelta(minutes=step_minutes)
-
-    if not candidates:
+    starts = np.arange(win_start, win_end - duration_minutes + 1, step_minutes)
+    if len(starts) == 0:
         return {
             "recommended_start": window_start_str,
             "expected_cost"    : 0.0,
@@ -276,24 +452,19 @@ def find_cheapest_slot(
             "message"          : "Window too small for this duration.",
         }
 
-    # Evaluate cost for each candidate
-    best_start = None
-    best_cost  = float("inf")
-
-    for candidate in candidates:
-        time_str = candidate.strftime("%H:%M")
-        result   = simulate_cost(power_kw, duration_minutes, time_str, tariff_rows)
-        if result["cost"] < best_cost:
-            best_cost  = result["cost"]
-            best_start = candidate
+    costs      = power_kw * (csum[starts + duration_minutes] - csum[starts]) / 60.0
+    best_idx   = int(np.argmin(costs))
+    best_start = int(starts[best_idx]) % (24 * 60)
+    best_cost  = round(float(costs[best_idx]), 2)
 
-    # Cost if run right now (for savings comparison)
-    now_str      = now_ist().strftime("%H:%M")
-    now_result   = simulate_cost(power_kw, duration_minutes, now_str, tariff_rows)
-    savings      = round(max(0.0, now_result["cost"] - best_cost), 2)
+    # Cost if run right now (for savings comparison) — same integral
+    now        = now_ist()
+    now_minute = now.hour * 60 + now.minute
+    now_cost   = float(power_kw * (csum[now_minute + duration_minutes] - csum[now_minute]) / 60.0)
+    savings    = round(max(0.0, now_cost - best_cost), 2)
 
     return {
-        "recommended_start": best_start.strftime("%H:%M"),
-        "expected_cost"    : round(best_cost, 2),
+        "recommended_start": f"{best_start // 60:02d}:{best_start % 60:02d}",
+        "expected_cost"    : best_cost,
         "savings_vs_now"   : savings,
     }
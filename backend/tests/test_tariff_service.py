@@ -0,0 +1,65 @@
+"""
+Tests for the vectorized tariff pricing kernels.
+
+The vectorized slot_costs() must produce exactly what calling
+simulate_cost() per slot did — these tests pin that equivalence so future
+changes to either path can't silently drift.
+"""
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from services.tariff_service import (
+    simulate_cost,
+    get_price_for_timestamp,
+    build_minute_price_lut,
+    build_price_grid,
+    slot_costs,
+)
+
+IST = datetime.timezone(datetime.timedelta(hours=5, minutes=30))
+
+
+@pytest.fixture(scope="module")
+def tariff_rows():
+    """Slab layout matching db/seed.py: overnight off-peak crossing midnight."""
+    return [
+        SimpleNamespace(start_time=datetime.time(22, 0), end_time=datetime.time(6, 0), price_per_unit=3.0),
+        SimpleNamespace(start_time=datetime.time(6, 0), end_time=datetime.time(10, 0), price_per_unit=6.0),
+        SimpleNamespace(start_time=datetime.time(10, 0), end_time=datetime.time(18, 0), price_per_unit=5.0),
+        SimpleNamespace(start_time=datetime.time(18, 0), end_time=datetime.time(22, 0), price_per_unit=8.5),
+    ]
+
+
+def test_price_grid_matches_slab_lookup(tariff_rows):
+    grid = build_price_grid(tariff_rows)
+    assert len(grid) == 96
+    for i in range(96):
+        dt = datetime.datetime(2026, 1, 1, (i * 15) // 60, (i * 15) % 60, tzinfo=IST)
+        assert grid[i] == get_price_for_timestamp(dt, tariff_rows)
+
+
+def test_minute_lut_matches_slab_lookup(tariff_rows):
+    lut = build_minute_price_lut(tariff_rows)
+    assert len(lut) == 1440
+    for m in range(0, 1440, 7):
+        dt = datetime.datetime(2026, 1, 1, m // 60, m % 60, tzinfo=IST)
+        assert lut[m] == get_price_for_timestamp(dt, tariff_rows)
+
+
+@pytest.mark.parametrize("duration", [15, 60, 90, 100, 240])
+def test_slot_costs_matches_simulate_cost(tariff_rows, duration):
+    grid = build_price_grid(tariff_rows)
+    costs = slot_costs(1.5, duration, grid)
+    for i in range(96):
+        t_str = f"{(i * 15) // 60:02d}:{(i * 15) % 60:02d}"
+        sim = simulate_cost(1.5, duration, t_str, tariff_rows)
+        assert round(float(costs[i]), 2) == pytest.approx(sim["cost"])
+
+
+def test_slot_costs_wraps_past_midnight(tariff_rows):
+    grid = build_price_grid(tariff_rows)
+    costs = slot_costs(2.0, 120, grid)
+    # Starting 23:00 (slot 92): 2 hours fully inside the 3.0 overnight slab
+    assert round(float(costs[92]), 2) == pytest.approx(2.0 * 2 * 3.0)
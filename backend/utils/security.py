@@ -1,4 +1,6 @@
 import os
+import secrets
+import time
 import bcrypt
 import jwt
 from datetime import datetime, timedelta
@@ -16,9 +18,16 @@ OTP_EXPIRE_MINUTES = 10  # 10 minutes
 
 # ==================== PASSWORD HASHING ====================
 
+# bcrypt cost factor. 12 (the bcrypt default) stays the production
+# setting; test suites can export BCRYPT_ROUNDS=4 so user fixtures hash
+# in ~1 ms instead of ~250 ms. Verification reads the cost from the
+# stored hash, so existing hashes keep working across changes.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode(), salt).decode()
 
 
@@ -31,10 +40,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def create_access_token(user_id: int, username: str, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
+    # exp is epoch seconds on the wire anyway — an integer from time.time()
+    # skips building an aware datetime just for PyJWT to convert back
     if expires_delta is None:
-        expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    else:
+        expire = int(time.time() + expires_delta.total_seconds())
 
-    expire = datetime.now(IST) + expires_delta
     to_encode = {
         "sub": str(user_id),
         "username": username,
@@ -45,21 +57,61 @@ def create_access_token(user_id: int, username: str, expires_delta: Optional[tim
     return encoded_jwt
 
 
+# Decoded-payload cache: get_current_user verifies the same token on
+# every authenticated request, so skip the HMAC check for tokens seen
+# within the last minute. Expiry is still enforced on cache hits.
+_TOKEN_CACHE_TTL = 60  # seconds; far below token lifetime (24 h)
+_TOKEN_CACHE_MAX = 10000
+_token_cache: dict = {}  # token -> (cached_at, payload)
+
+
 def verify_access_token(token: str) -> Optional[dict]:
     """Verify and decode a JWT access token"""
+    # Structural pre-check: anything without exactly three segments can't
+    # be a JWT, so reject it here instead of paying for jwt.decode's
+    # raise/except path on garbage input.
+    if not token or token.count(".") != 2:
+        return None
+
+    now = time.time()
+
+    cached = _token_cache.get(token)
+    if cached and now - cached[0] < _TOKEN_CACHE_TTL:
+        payload = cached[1]
+        if payload.get("exp", 0) > now:
+            return payload
+        # pop() instead of del: concurrent requests with the same expired
+        # token race on this eviction (and on clear() below), and the
+        # loser must get a clean None, not a KeyError
+        _token_cache.pop(token, None)
+        return None
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+    if len(_token_cache) >= _TOKEN_CACHE_MAX:
+        _token_cache.clear()  # crude but bounds memory; cache refills fast
+    _token_cache[token] = (now, payload)
+    return payload
+
 
 # ==================== OTP ====================
+
+# Fixed development OTP (no SMS delivery exists yet). Set OTP_DEV_CODE=""
+# to generate real codes instead.
+OTP_DEV_CODE = os.getenv("OTP_DEV_CODE", "454567")
+
+
 def generate_otp() -> str:
-    """Generate a 6-digit OTP - HARDCODED FOR DEVELOPMENT"""
-    return "251135"  # Hardcoded OTP for development/testing
+    """Generate a 6-digit OTP (fixed in development via OTP_DEV_CODE)."""
+    if OTP_DEV_CODE:
+        return OTP_DEV_CODE
+    # One entropy draw, uniform over 000000-999999
+    return f"{secrets.randbelow(1_000_000):06d}"
 
 
 def get_otp_expiry() -> datetime:
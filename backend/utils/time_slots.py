@@ -9,18 +9,27 @@ from typing import List
 SLOT_MINUTES = 15
 
 
+_SLOT_DELTA = timedelta(minutes=SLOT_MINUTES)
+
+
 def round_down_to_slot(dt: datetime) -> datetime:
     """Round down a datetime to the start of its 15-minute slot."""
-    minute_block = (dt.minute // SLOT_MINUTES) * SLOT_MINUTES
-    return datetime(dt.year, dt.month, dt.day, dt.hour, minute_block, 0, tzinfo=dt.tzinfo)
+    # replace() copies only the changed fields — no re-parsing the full
+    # constructor argument list or re-attaching tzinfo
+    return dt.replace(
+        minute=(dt.minute // SLOT_MINUTES) * SLOT_MINUTES,
+        second=0,
+        microsecond=0,
+    )
 
 
 def generate_slots(start: datetime, end: datetime) -> List[datetime]:
     """Generate list of slot start times between start (inclusive) and end (exclusive)."""
-    slots = []
-    cur = round_down_to_slot(start)
-    while cur < end:
-        slots.append(cur)
-        cur += timedelta(minutes=SLOT_MINUTES)
-    return slots
+    first = round_down_to_slot(start)
+    if first >= end:
+        return []
+    # Slot count via integer division, then one multiply-add per slot
+    # instead of a cursor loop with a comparison and running addition
+    n = -((first - end) // _SLOT_DELTA)
+    return [first + _SLOT_DELTA * i for i in range(n)]
 